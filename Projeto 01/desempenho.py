@@ -0,0 +1,251 @@
+"""Medições de desempenho de projeto_1. Executar com:
+
+    python desempenho.py [medicao ...] [--completo]
+
+Sem argumentos corre todas as medições. Sem --completo os casos mais lentos
+das implementações de referência são saltados (assinalados com "-").
+"""
+import random
+import sys
+import time
+
+import projeto_1
+from teste_resultados_eleicoes import atribui_mandatos_original
+
+
+def mede(funcao, *args, minimo=0.2):
+    """Devolve o melhor tempo, em segundos, de uma chamada a funcao(*args),
+    repetindo-a até acumular pelo menos minimo segundos.
+    """
+    melhor, total = float("inf"), 0.0
+    while total < minimo:
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempo = time.perf_counter() - inicio
+        melhor, total = min(melhor, tempo), total + tempo
+    return melhor
+
+def formata(tempo):
+    if tempo is None:
+        return "-"
+    return "%.3g s" % tempo if tempo >= 1 else "%.3g ms" % (tempo * 1000)
+
+def desempenho_mandatos(completo):
+    gerador = random.Random(1)
+    print("atribui_mandatos: tabela de quocientes (original) vs fila de prioridade")
+    print("%8s %9s %14s %14s %9s" % ("partidos", "deputados", "original", "heap", "ganho"))
+    for partidos in (10, 100, 1000):
+        votos = {"P%d" % i: gerador.randint(1, 10**6) for i in range(partidos)}
+        for deputados in (10, 100, 1000, 10000):
+            original = None
+            if completo or partidos * deputados <= 10**5:
+                original = mede(atribui_mandatos_original, votos, deputados)
+            heap = mede(projeto_1.atribui_mandatos_heap, votos, deputados)
+            print("%8d %9d %14s %14s %9s" % (partidos, deputados, formata(original),\
+                 formata(heap), "-" if original is None else "%.1fx" % (original / heap)))
+
+def mandatos_cenarios(votos, deputados):
+    """Versão escalar de atribui_mandatos_lote: um atribui_mandatos_heap por cenário."""
+    nomes = ["P%d" % j for j in range(len(votos[0]))]
+    resultado = []
+    for cenario in votos:
+        mandatos = projeto_1.atribui_mandatos_heap(dict(zip(nomes, cenario)), deputados)
+        resultado += [[mandatos.count(nome) for nome in nomes]]
+    return resultado
+
+def desempenho_lote(completo):
+    import numpy as np
+    gerador = np.random.default_rng(4)
+    print("atribui_mandatos_lote (NumPy) vs atribui_mandatos_heap por cenario, 10 partidos")
+    print("%9s %9s %16s %16s %9s" % ("cenarios", "deputados", "escalar (c/s)", "lote (c/s)", "ganho"))
+    for n_cenarios in (100, 1000, 10000):
+        for deputados in (10, 50, 230):
+            votos = gerador.integers(1, 10**6, size = (n_cenarios, 10))
+            escalar = None
+            if completo or n_cenarios * deputados <= 10**6:
+                escalar = mede(mandatos_cenarios, votos.tolist(), deputados)
+            lote = mede(projeto_1.atribui_mandatos_lote, votos, deputados)
+            print("%9d %9d %16s %16.0f %9s" % (n_cenarios, deputados, "-" if escalar is None\
+                 else "%.0f" % (n_cenarios / escalar), n_cenarios / lote, "-" if escalar is None\
+                     else "%.1fx" % (escalar / lote)))
+
+def metodo_hondt_erros_original(info_eleicoes):
+    """Validação original de metodo_hondt_erros, congelada para comparação."""
+    if type(info_eleicoes) != dict or info_eleicoes == {} or not all(type(key) == str\
+         for key in info_eleicoes.keys()):
+        raise ValueError("obtem_resultado_eleicoes: argumento invalido")
+    for territorio in info_eleicoes:
+        if type(info_eleicoes[territorio]) != dict or list(info_eleicoes[territorio].keys())\
+             != ["deputados", "votos"] or type(info_eleicoes[territorio]["votos"]) != dict or \
+                info_eleicoes[territorio]["votos"] == {} or type(info_eleicoes[territorio]\
+                    ["deputados"]) != int or info_eleicoes[territorio]["deputados"] < 1 or not\
+                        all(type(n) == int and n > 0 for n in list(info_eleicoes[territorio]\
+                            ["votos"].values())) or not all(type(partido) == str  for partido\
+                                in info_eleicoes[territorio]["votos"]):
+            raise ValueError("obtem_resultado_eleicoes: argumento invalido")
+    return info_eleicoes
+
+def desempenho_validacao(completo):
+    gerador = random.Random(6)
+    print("metodo_hondt_erros em 10 000 territorios de 10 partidos")
+    info_eleicoes = {"T%d" % t: {"deputados": gerador.randint(1, 50), "votos": {"P%d" % p:\
+         gerador.randint(1, 10**5) for p in range(10)}} for t in range(10000)}
+    original = mede(metodo_hondt_erros_original, info_eleicoes)
+    passagem = mede(projeto_1.metodo_hondt_erros, info_eleicoes)
+    projeto_1.metodo_hondt_erros(info_eleicoes, 1)
+    cache = mede(projeto_1.metodo_hondt_erros, info_eleicoes, 1)
+    projeto_1.validacoes.clear()
+    print("%-28s %12s" % ("original", formata(original)))
+    print("%-28s %12s %8.1fx" % ("uma passagem", formata(passagem), original / passagem))
+    print("%-28s %12s %8.0fx" % ("em cache (mesma versao)", formata(cache), original / cache))
+
+def corta_texto_original(cad, coluna_l):
+    palavras = cad.split()
+    str1 = str2 = ""
+    for p in range(len(palavras)):
+        if p == 0:
+            str1 = palavras[p]
+        elif len(str1) + 1 + len(palavras[p]) > coluna_l:
+            str2 = " ".join(palavras[p:])
+            return (str1, str2)
+        else:
+            str1 += " " + palavras[p]
+    return (str1, str2)
+
+def insere_espacos_original(cad, coluna_l):
+    espacos = coluna_l - len(cad)
+    new_cad = ""
+    if cad.count(" ") == 0:
+        new_cad = cad.ljust(coluna_l)
+    else:
+        cad_list = cad.split()
+        for c in range(len(cad_list) - 1):
+            cad_list[c] = cad_list[c] + ((espacos // (len(cad_list) - 1)) + 1) * " "
+        for w in range(espacos % (len(cad_list) - 1)):
+            cad_list[w] = cad_list[w] + " "
+        for p in range(len(cad_list)):
+            new_cad += cad_list[p]
+    return new_cad
+
+def justifica_texto_original(cad, coluna_l):
+    """Justificação original (corta_texto + insere_espacos), congelada para comparação."""
+    cad_limpa = projeto_1.limpa_texto(cad)
+    cadeia_just, cad_resto = (), " "
+    while cad_resto != "":
+        cad_cortada, cad_resto = corta_texto_original(cad_limpa, coluna_l)
+        if cad_resto == "":
+            return cadeia_just + (str(cad_cortada).ljust(coluna_l), )
+        cadeia_just += (insere_espacos_original(cad_cortada, coluna_l), )
+        cad_limpa = cad_resto
+
+def gera_texto(n_bytes, semente):
+    """Devolve um texto com cerca de n_bytes carateres, formado por palavras
+    aleatórias de 1 a 12 letras.
+    """
+    gerador = random.Random(semente)
+    vocabulario = ["".join(gerador.choice("abcdefghijklmnopqrstuvwxyz") for _ in\
+         range(gerador.randint(1, 12))) for _ in range(1000)]
+    return " ".join(gerador.choices(vocabulario, k = n_bytes // 7))
+
+def desempenho_quebra(completo):
+    print("justifica_texto (modo guloso, sem cache), coluna de 80 carateres")
+    print("%10s %10s %16s %16s" % ("texto", "linhas", "original (l/s)", "motor (l/s)"))
+    tamanhos = (10**4, 10**5, 10**6, 10**7) + ((10**8,) if completo else ())
+    for n_bytes in tamanhos:
+        texto = gera_texto(n_bytes, 9)
+        inicio = time.perf_counter()
+        linhas = projeto_1.justifica_texto(texto, 80, cache = False)
+        motor = time.perf_counter() - inicio
+        original = None
+        if n_bytes <= 10**5:
+            original = mede(justifica_texto_original, texto, 80)
+            assert justifica_texto_original(texto, 80) == linhas
+        print("%8.2f MB %10d %16s %16.0f" % (n_bytes / 10**6, len(linhas), "-" if original is\
+             None else "%.0f" % (len(linhas) / original), len(linhas) / motor))
+        del texto, linhas
+
+def desempenho_modos(completo):
+    print("justifica_texto: modo guloso vs modo otimo (sem cache), coluna de 80 carateres")
+    print("%10s %14s %14s %14s %14s" % ("texto", "gulosa (p/s)", "otima (p/s)", "janela 8 (p/s)",\
+         "tempo ot./gul."))
+    for n_bytes in (10**5, 10**6) + ((10**7,) if completo else ()):
+        texto = gera_texto(n_bytes, 11)
+        palavras = len(texto.split())
+        tempos = [mede(projeto_1.justifica_texto, texto, 80, modo, janela, False) for modo, janela\
+             in (("gulosa", None), ("otima", None), ("otima", 8))]
+        print("%8.2f MB %14.0f %14.0f %14.0f %13.1fx" % (n_bytes / 10**6, palavras / tempos[0],\
+             palavras / tempos[1], palavras / tempos[2], tempos[1] / tempos[0]))
+
+def gera_sistema(n, semente):
+    """Devolve um sistema n x n estritamente diagonal dominante."""
+    gerador = random.Random(semente)
+    matriz = tuple(tuple(float(n) if i == j else gerador.random() for j in range(n))\
+         for i in range(n))
+    return matriz, tuple(gerador.uniform(-10, 10) for i in range(n))
+
+def desempenho_jacobi(completo):
+    print("Jacobi: nucleo Python vs nucleo NumPy (precisao 1e-8)")
+    print("%6s %14s %14s %9s %22s" % ("n", "jacobi", "jacobi_numpy", "ganho",\
+         "resolve_sistema numpy"))
+    for n in (10, 50, 100, 500, 1000, 2000) + ((5000,) if completo else ()):
+        matriz, constantes = gera_sistema(n, 14)
+        python = None
+        if completo or n <= 500:
+            python = mede(projeto_1.jacobi, matriz, constantes, 1e-8)
+        numpy = mede(projeto_1.jacobi_numpy, matriz, constantes, 1e-8)
+        total = mede(projeto_1.resolve_sistema, matriz, constantes, 1e-8, "numpy")
+        print("%6d %14s %14s %9s %22s" % (n, formata(python), formata(numpy), "-" if python\
+             is None else "%.0fx" % (python / numpy), formata(total)))
+        del matriz
+
+def mede_memoria(funcao, *args):
+    """Devolve o pico de memória, em bytes, registado pelo tracemalloc durante
+    uma chamada a funcao(*args), acima da memória já ocupada antes da chamada.
+    """
+    import tracemalloc
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    funcao(*args)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico - inicio
+
+def desempenho_alocacoes(completo):
+    from array import array
+    print("Jacobi: nucleo com listas (jacobi) vs buffers array('d') (jacobi_array)")
+    print("pico = memoria transitoria maxima (tracemalloc); por iteracao = crescimento do")
+    print("pico entre 1 e 21 iteracoes, dividido por 20")
+    print("%6s %-13s %12s %16s %14s" % ("n", "nucleo", "pico (KB)", "por iteracao (B)",\
+         "t/iteracao"))
+    for n in (100, 300) + ((1000,) if completo else ()):
+        matriz, constantes = gera_sistema(n, 19)
+        linhas = [array("d", linha) for linha in matriz]
+        inverso = array("d", (1 / matriz[i][i] for i in range(n)))
+        # precisao 1e-300: o limite de iterações é sempre atingido
+        nucleos = (("jacobi", lambda k: projeto_1.jacobi(matriz, constantes, 1e-300, None, k)),\
+             ("jacobi_array", lambda k: projeto_1.jacobi_array(linhas, inverso, constantes,\
+                 1e-300, None, k)))
+        for nome, nucleo in nucleos:
+            pico_1, pico_21 = mede_memoria(nucleo, 1), mede_memoria(nucleo, 21)
+            tempo = mede(nucleo, 21) / 21
+            print("%6d %-13s %12.1f %16.0f %14s" % (n, nome, pico_21 / 1024, (pico_21 - pico_1)\
+                 / 20, formata(tempo)))
+
+MEDICOES = {"mandatos": desempenho_mandatos, "lote": desempenho_lote,\
+     "validacao": desempenho_validacao, "quebra": desempenho_quebra, "modos": desempenho_modos,\
+         "jacobi": desempenho_jacobi, "alocacoes": desempenho_alocacoes}
+
+def main(argv):
+    completo = "--completo" in argv
+    nomes = [nome for nome in argv if nome != "--completo"] or list(MEDICOES)
+    for nome in nomes:
+        if nome not in MEDICOES:
+            print("medicao desconhecida: %s (disponiveis: %s)" % (nome, ", ".join(MEDICOES)))
+            return 1
+    for nome in nomes:
+        MEDICOES[nome](completo)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,3 +1,17 @@
+import bisect
+import heapq
+import operator
+import os
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from multiprocessing import Barrier, Process
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError, Event, Thread
+
 def limpa_texto(cad):
     """Remove carateres brancos de uma cadeia de carateres.
 
@@ -9,6 +23,120 @@ def limpa_texto(cad):
     """    
     return " ".join(cad.split())                      
 
+def tokeniza_texto(cad):
+    """Divide a cadeia em palavras uma única vez e devolve as palavras, a posição
+    de cada uma na cadeia limpa e o respetivo comprimento.
+
+    Args:
+        cad (str): cadeia de carateres qualquer
+
+    Returns:
+        list: palavras da cadeia
+        array: posição de cada palavra na cadeia limpa
+        array: comprimento de cada palavra
+    """
+    palavras = cad.split()
+    comprimentos = array("l", map(len, palavras))
+    posicoes, posicao = array("l", bytes(comprimentos.itemsize * len(palavras))), 0
+    for i, comprimento in enumerate(comprimentos):
+        posicoes[i] = posicao
+        posicao += comprimento + 1
+    return palavras, posicoes, comprimentos
+
+def calcula_cortes(comprimentos, coluna_l):
+    """Calcula, numa única passagem, o índice da primeira palavra de cada linha
+    quando as palavras são colocadas por ordem em linhas de largura coluna_l.
+
+    Args:
+        comprimentos (array): comprimento de cada palavra
+        coluna_l (int): largura da coluna
+
+    Returns:
+        array: índice da primeira palavra de cada linha
+    """
+    cortes, comprimento_linha = array("l"), 0
+    for i, comprimento in enumerate(comprimentos):
+        if i == 0 or comprimento_linha + 1 + comprimento > coluna_l:
+            cortes.append(i)
+            comprimento_linha = comprimento
+        else:
+            comprimento_linha += 1 + comprimento
+    return cortes
+
+def calcula_cortes_otimos(comprimentos, coluna_l, janela):
+    """Calcula os cortes que minimizam a soma dos quadrados dos espaços em falta
+    em cada linha (exceto a última), por programação dinâmica do fim para o
+    início do texto. Cada linha tem no máximo janela palavras, pelo que o tempo
+    é O(palavras x janela).
+
+    Args:
+        comprimentos (array): comprimento de cada palavra
+        coluna_l (int): largura da coluna
+        janela (int): número máximo de palavras por linha
+
+    Returns:
+        array: índice da primeira palavra de cada linha
+    """
+    n = len(comprimentos)
+    custos = array("d", bytes(8 * (n + 1)))
+    seguintes = array("l", bytes(comprimentos.itemsize * (n + 1)))
+    for i in range(n - 1, -1, -1):
+        comprimento_linha, custos[i] = -1, float("inf")
+        for j in range(i + 1, min(n, i + janela) + 1):
+            comprimento_linha += comprimentos[j - 1] + 1
+            if comprimento_linha > coluna_l and j > i + 1:
+                break
+            custo = custos[j] + (0 if j == n else (coluna_l - comprimento_linha) ** 2)
+            if custo <= custos[i]:
+                custos[i], seguintes[i] = custo, j
+    cortes, i = array("l"), 0
+    while i < n:
+        cortes.append(i)
+        i = seguintes[i]
+    return cortes
+
+def espaca_linha(palavras, inicio, fim, espacos):
+    """Junta as palavras de inicio a fim distribuindo os espaços em falta pelos
+    intervalos entre elas, começando pelos da esquerda.
+
+    Args:
+        palavras (list): palavras do texto
+        inicio (int): índice da primeira palavra da linha
+        fim (int): índice seguinte ao da última palavra da linha
+        espacos (int): número de espaços em falta na linha
+
+    Returns:
+        str: linha com os espaços distribuídos
+    """
+    base, extra = divmod(espacos, fim - inicio - 1)
+    separador = (base + 1) * " "
+    return separador.join([(separador + " ").join(palavras[inicio:inicio + extra + 1])] +\
+         palavras[inicio + extra + 1:fim])
+
+def justifica_linhas(palavras, posicoes, comprimentos, cortes, coluna_l):
+    """Gera as linhas justificadas correspondentes aos cortes calculados.
+
+    Args:
+        palavras (list): palavras do texto
+        posicoes (array): posição de cada palavra na cadeia limpa
+        comprimentos (array): comprimento de cada palavra
+        cortes (array): índice da primeira palavra de cada linha
+        coluna_l (int): largura da coluna
+
+    Returns:
+        generator: gerador de cadeias de carateres justificadas
+    """
+    for k in range(len(cortes)):
+        inicio = cortes[k]
+        if k == len(cortes) - 1:
+            yield " ".join(palavras[inicio:]).ljust(coluna_l)
+        elif cortes[k + 1] - inicio == 1:
+            yield palavras[inicio].ljust(coluna_l)
+        else:
+            fim = cortes[k + 1]
+            yield espaca_linha(palavras, inicio, fim, coluna_l - (posicoes[fim - 1] +\
+                 comprimentos[fim - 1] - posicoes[inicio]))
+
 def corta_texto(cad, coluna_l):
     """Devolve duas cadeias de carateres, a primeira com um comprimento até à largura
     fornecida e a segunda contendo o resto do texto.
@@ -20,17 +148,12 @@ def corta_texto(cad, coluna_l):
     Returns:
         tuple: tuplo constituído por duas cadeias de carateres
     """    
-    palavras = cad.split()             
-    str1 = str2 = ""
-    for p in range(len(palavras)):
-        if p == 0:
-            str1 = palavras[p]
-        elif len(str1) + 1 + len(palavras[p]) > coluna_l:                     
-            str2 = " ".join(palavras[p:])
-            return (str1, str2) 
-        else:
-            str1 += " " + palavras[p]
-    return (str1, str2) 
+    palavras, posicoes, comprimentos = tokeniza_texto(cad)
+    cortes = calcula_cortes(comprimentos, coluna_l)
+    if len(cortes) < 2:
+        return (" ".join(palavras), "")
+    cad_limpa = " ".join(palavras)
+    return (cad_limpa[:posicoes[cortes[1]] - 1], cad_limpa[posicoes[cortes[1]]:])
 
 def insere_espacos(cad, coluna_l):
     """Devolve uma cadeia de carateres de comprimento igual à largura da coluna formada
@@ -44,27 +167,113 @@ def insere_espacos(cad, coluna_l):
     Returns:
         str: cadeia de carateres de comprimento igual à largura da coluna
     """    
-    espacos = coluna_l - len(cad)
-    new_cad = ""
     if cad.count(" ") == 0:
-        new_cad = cad.ljust(coluna_l)
-    else:
-        cad_list = cad.split()
-        for c in range(len(cad_list) - 1):
-            cad_list[c] = cad_list[c] + ((espacos // (len(cad_list) - 1)) + 1) * " "
-        for w in range(espacos % (len(cad_list) - 1)):
-            cad_list[w] = cad_list[w] + " "
-        for p in range(len(cad_list)):
-            new_cad += cad_list[p]
-    return new_cad
-
-def justifica_texto(cad, coluna_l):
+        return cad.ljust(coluna_l)
+    palavras = cad.split()
+    return espaca_linha(palavras, 0, len(palavras), coluna_l - len(cad))
+
+def cria_cache_justificacao(max_entradas=1024, max_bytes=2**24):
+    """Devolve uma cache LRU de textos justificados, limitada no número de
+    entradas e no número de bytes ocupados pelos textos e linhas guardados.
+    Representação interna: {"entradas": OrderedDict, "max_entradas": int,
+    "max_bytes": int, "bytes": int, "acertos": int, "falhas": int}
+
+    Args:
+        max_entradas (int, optional): número máximo de entradas
+        max_bytes (int, optional): número máximo de bytes
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: cache vazia
+    """
+    if type(max_entradas) != int or max_entradas < 1 or type(max_bytes) != int or max_bytes < 1:
+        raise ValueError("cria_cache_justificacao: argumentos invalidos")
+    return {"entradas": OrderedDict(), "max_entradas": max_entradas, "max_bytes": max_bytes,\
+         "bytes": 0, "acertos": 0, "falhas": 0}
+
+def consulta_cache(cache, chave):
+    """Devolve o tuplo guardado para a chave, marcando-o como o mais recente,
+    ou None caso não exista.
+
+    Args:
+        cache (dict): cache de textos justificados
+        chave (tuple): texto limpo, largura da coluna, modo e janela
+
+    Returns:
+        tuple: tuplo de cadeias de carateres justificadas ou None
+    """
+    entrada = cache["entradas"].get(chave)
+    if entrada is None:
+        cache["falhas"] += 1
+        return None
+    cache["acertos"] += 1
+    cache["entradas"].move_to_end(chave)
+    return entrada[0]
+
+def guarda_cache(cache, chave, linhas):
+    """Guarda o tuplo na cache, descartando as entradas usadas há mais tempo até
+    os limites de entradas e de bytes serem respeitados.
+
+    Args:
+        cache (dict): cache de textos justificados
+        chave (tuple): texto limpo, largura da coluna, modo e janela
+        linhas (tuple): tuplo de cadeias de carateres justificadas
+    """
+    tamanho = sys.getsizeof(chave[0]) + sys.getsizeof(linhas) + sum(map(sys.getsizeof, linhas))
+    if tamanho > cache["max_bytes"] or chave in cache["entradas"]:
+        return
+    entradas = cache["entradas"]
+    while entradas != {} and (len(entradas) >= cache["max_entradas"] or cache["bytes"] +\
+         tamanho > cache["max_bytes"]):
+        cache["bytes"] -= entradas.popitem(last = False)[1][1]
+    entradas[chave] = (linhas, tamanho)
+    cache["bytes"] += tamanho
+
+def obtem_estatisticas_cache(cache):
+    """Devolve o número de acertos, de falhas, de entradas e de bytes da cache.
+
+    Args:
+        cache (dict): cache de textos justificados
+
+    Returns:
+        dict: estatísticas da cache
+    """
+    return {"acertos": cache["acertos"], "falhas": cache["falhas"], "entradas":\
+         len(cache["entradas"]), "bytes": cache["bytes"]}
+
+def limpa_cache(cache):
+    """Modifica destrutivamente a cache removendo todas as entradas e
+    estatísticas, e devolve-a.
+
+    Args:
+        cache (dict): cache de textos justificados
+
+    Returns:
+        dict: cache vazia
+    """
+    cache["entradas"].clear()
+    cache["bytes"] = cache["acertos"] = cache["falhas"] = 0
+    return cache
+
+cache_justificacao = cria_cache_justificacao()
+
+def justifica_texto(cad, coluna_l, modo="gulosa", janela=None, cache=True):
     """Recebe uma cadeia de carateres não vazia e um inteiro positivo e devolve um tuplo
-    de cadeias de carateres justificadas.
+    de cadeias de carateres justificadas. No modo "gulosa" cada linha leva tantas
+    palavras quantas couberem; no modo "otima" os cortes minimizam a irregularidade
+    dos espaços, olhando no máximo janela palavras à frente. Os resultados ficam
+    guardados numa cache indexada pelo texto limpo e pela largura da coluna.
 
     Args:
         cad (str): cadeia de carateres não vazia
         coluna_l (int): largura da coluna
+        modo (str, optional): "gulosa" ou "otima"
+        janela (int, optional): número máximo de palavras por linha no modo "otima";
+        por omissão, o máximo que cabe numa linha
+        cache (universal, optional): True para usar cache_justificacao, False para
+        não usar cache, ou uma cache criada por cria_cache_justificacao
 
     Raises:
         ValueError: Argumentos inválidos
@@ -72,20 +281,144 @@ def justifica_texto(cad, coluna_l):
     Returns:
         tuple:  tuplo de cadeias de carateres justificadas
     """    
-    if type(cad) != str or cad == "" or type(coluna_l) != int or not\
-         all (len(w) <= coluna_l for w in limpa_texto(cad).split()):
+    if type(cad) != str or cad == "" or type(coluna_l) != int or modo not in ("gulosa",\
+         "otima") or (janela is not None and (type(janela) != int or janela < 1)) or\
+             type(cache) not in (bool, dict):
+        raise ValueError("justifica_texto: argumentos invalidos")
+    if cache is False:
+        return justifica_texto_aux(cad, coluna_l, modo, janela)
+    if cache is True:
+        cache = cache_justificacao
+    chave = (limpa_texto(cad), coluna_l, modo, janela)
+    linhas = consulta_cache(cache, chave)
+    if linhas is None:
+        linhas = justifica_texto_aux(chave[0], coluna_l, modo, janela)
+        guarda_cache(cache, chave, linhas)
+    return linhas
+
+def justifica_texto_aux(cad, coluna_l, modo, janela):
+    palavras, posicoes, comprimentos = tokeniza_texto(cad)
+    if palavras == []:
+        return ("".ljust(coluna_l), )
+    if max(comprimentos) > coluna_l:
         raise ValueError("justifica_texto: argumentos invalidos")
-    cad_limpa = limpa_texto(cad)
-    cadeia_just, cad_resto = (), " "
-    while cad_resto != "":                                                  
-        cad_v2 = corta_texto(cad_limpa, coluna_l)
-        cad_cortada,  cad_resto = cad_v2[0], cad_v2[1]
-        if cad_resto == "":
-            cadeia_just+= (str(cad_cortada).ljust(coluna_l), )
-            return cadeia_just
-        cadeia_just += (insere_espacos(cad_cortada, coluna_l), )
-        cad_limpa = cad_resto
+    if modo == "gulosa":
+        cortes = calcula_cortes(comprimentos, coluna_l)
+    else:
+        cortes = calcula_cortes_otimos(comprimentos, coluna_l, janela or (coluna_l + 1) // 2)
+    return tuple(justifica_linhas(palavras, posicoes, comprimentos, cortes, coluna_l))
         
+def justifica_texto_gerador(texto, coluna_l):
+    """Versão de justifica_texto que lê as palavras à medida que são precisas e
+    devolve as linhas justificadas uma a uma, mantendo em memória apenas a linha
+    atual. As linhas produzidas são as mesmas de justifica_texto, mas um erro
+    numa palavra demasiado longa só é detetado quando a palavra é lida.
+
+    Args:
+        texto (iterable): cadeia de carateres, ficheiro ou iterável de cadeias
+        coluna_l (int): largura da coluna
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        generator: gerador de cadeias de carateres justificadas
+    """
+    if type(coluna_l) != int:
+        raise ValueError("justifica_texto: argumentos invalidos")
+    if type(texto) == str:
+        texto = (texto, )
+
+    def obtem_palavras(texto):
+        resto, vazio = "", True
+        for bloco in texto:
+            if type(bloco) != str:
+                raise ValueError("justifica_texto: argumentos invalidos")
+            vazio = vazio and bloco == ""
+            cad = resto + bloco
+            palavras, resto = cad.split(), ""
+            # a última palavra pode continuar no bloco seguinte
+            if palavras != [] and not cad[-1].isspace():
+                resto = palavras.pop()
+            yield from palavras
+        if vazio:
+            raise ValueError("justifica_texto: argumentos invalidos")
+        if resto != "":
+            yield resto
+
+    def justifica_aux(texto):
+        linha, comprimento = [], 0
+        for palavra in obtem_palavras(texto):
+            if len(palavra) > coluna_l:
+                raise ValueError("justifica_texto: argumentos invalidos")
+            if linha == []:
+                linha, comprimento = [palavra], len(palavra)
+            elif comprimento + 1 + len(palavra) > coluna_l:
+                yield linha[0].ljust(coluna_l) if len(linha) == 1 else\
+                     espaca_linha(linha, 0, len(linha), coluna_l - comprimento)
+                linha, comprimento = [palavra], len(palavra)
+            else:
+                linha += [palavra]
+                comprimento += 1 + len(palavra)
+        yield " ".join(linha).ljust(coluna_l)
+
+    return justifica_aux(texto)
+
+def justifica_bloco(paragrafos, coluna_l):
+    """Justifica cada um dos parágrafos de um bloco.
+
+    Args:
+        paragrafos (list): lista de cadeias de carateres não vazias
+        coluna_l (int): largura da coluna
+
+    Returns:
+        list: lista de tuplos de cadeias de carateres justificadas
+    """
+    return [justifica_texto(paragrafo, coluna_l) for paragrafo in paragrafos]
+
+def justifica_paragrafos(paragrafos, coluna_l, processos=None, bloco=64, minimo=256):
+    """Justifica parágrafos independentes, distribuindo-os em blocos por vários
+    processos. Os resultados são devolvidos pela ordem dos parágrafos e apenas
+    alguns blocos estão pendentes de cada vez, pelo que a memória usada não
+    depende do número de parágrafos. Com menos de minimo parágrafos, ou um só
+    processo, a justificação é feita em série.
+
+    Args:
+        paragrafos (iterable): cadeias de carateres não vazias
+        coluna_l (int): largura da coluna
+        processos (int, optional): número de processos; por omissão, o número de CPUs
+        bloco (int, optional): número de parágrafos enviados de cada vez a um processo
+        minimo (int, optional): número mínimo de parágrafos para usar processos
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        generator: gerador de tuplos de cadeias de carateres justificadas
+    """
+    if type(coluna_l) != int or (processos is not None and (type(processos) != int or\
+         processos < 1)) or type(bloco) != int or bloco < 1 or type(minimo) != int:
+        raise ValueError("justifica_paragrafos: argumentos invalidos")
+    n_processos = processos or os.cpu_count() or 1
+
+    def justifica_aux(paragrafos):
+        primeiros = list(islice(paragrafos, minimo))
+        fluxo = chain(primeiros, paragrafos)
+        if len(primeiros) < minimo or n_processos == 1:
+            for paragrafo in fluxo:
+                yield justifica_texto(paragrafo, coluna_l)
+            return
+        pendentes = deque()
+        with ProcessPoolExecutor(max_workers = n_processos) as executor:
+            for paragrafos_bloco in iter(lambda: list(islice(fluxo, bloco)), []):
+                pendentes.append(executor.submit(justifica_bloco, paragrafos_bloco, coluna_l))
+                if len(pendentes) >= 2 * n_processos:
+                    yield from pendentes.popleft().result()
+            while pendentes:
+                yield from pendentes.popleft().result()
+
+    return justifica_aux(iter(paragrafos))
+
 def calcula_quocientes(dict_votos, deputados):
     """Devolve um dicionário com as mesmas chaves do dicionário argumento contendo
      a lista (de comprimento igual ao número de deputados) com os quocientes
@@ -120,20 +453,122 @@ def atribui_mandatos(dict_votos, deputados):
     Returns:
         list: lista ordenada de partidos que obtiveram mandato
     """    
+    return atribui_mandatos_heap(dict_votos, deputados)
+
+def atribui_mandatos_heap(dict_votos, deputados):
+    """Devolve a lista de mandatos de atribui_mandatos. Em vez de construir a
+    tabela completa de calcula_quocientes, calcula os quocientes apenas quando
+    um partido ganha um mandato, usando uma fila de prioridade. Em caso de
+    empate no quociente ganha o partido com menos votos.
+
+    Args:
+        dict_votos (dict): votos apurados num círculo
+        deputados (int): número de deputados
+
+    Returns:
+        list: lista ordenada de partidos que obtiveram mandato
+    """
+    # entradas: (-quociente, votos, -posicao, divisor, partido); com os mesmos
+    # votos ganha o partido que aparece mais tarde no dicionário
+    fila = [(-votos, votos, -i, 1, partido) for i, (partido, votos) in\
+         enumerate(dict_votos.items())]
+    heapq.heapify(fila)
     mandatos = []
-    quocientes = calcula_quocientes(dict_votos, deputados)
     for i in range(deputados):
-        votenum = 0
-        for partido in quocientes:
-            if quocientes[partido][0] > votenum:
-                votenum, partidocache = quocientes[partido][0], partido
-            if quocientes[partido][0] == votenum and dict_votos[partido] <=\
-                dict_votos[partidocache]:
-                    partidocache = partido
-        mandatos += [partidocache]
-        quocientes[partidocache].pop(0)
+        quociente, votos, posicao, divisor, partido = fila[0]
+        mandatos += [partido]
+        heapq.heapreplace(fila, (-(votos / (divisor + 1)), votos, posicao, divisor + 1, partido))
+    return mandatos
+
+def atribui_mandatos_lote(votos, deputados):
+    """Aplica o método de Hondt a vários cenários de votação de uma só vez,
+    com operações vetoriais do NumPy. Cada linha da matriz de votos é um
+    cenário e cada coluna um partido; o desempate é o de atribui_mandatos.
+
+    Args:
+        votos (numpy.ndarray): matriz de inteiros positivos (cenários x partidos)
+        deputados (int): número de deputados
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        numpy.ndarray: matriz com o número de mandatos (cenários x partidos)
+    """
+    import numpy as np
+    votos = np.asarray(votos)
+    if votos.ndim != 2 or votos.shape[1] == 0 or not np.issubdtype(votos.dtype, np.integer)\
+         or (votos <= 0).any() or type(deputados) != int or deputados < 1:
+        raise ValueError("atribui_mandatos_lote: argumentos invalidos")
+    n_cenarios, n_partidos = votos.shape
+    votos_f = votos.astype(np.float64)
+    mandatos = np.zeros(votos.shape, dtype = np.int64)
+    cenarios = np.arange(n_cenarios)
+    for i in range(deputados):
+        quocientes = votos_f / (mandatos + 1)
+        empatados = quocientes == quocientes.max(axis = 1, keepdims = True)
+        votos_empatados = np.where(empatados, votos_f, np.inf)
+        empatados &= votos_empatados == votos_empatados.min(axis = 1, keepdims = True)
+        # entre partidos com os mesmos votos ganha o último, como em atribui_mandatos
+        vencedores = n_partidos - 1 - empatados[:, ::-1].argmax(axis = 1)
+        mandatos[cenarios, vencedores] += 1
     return mandatos
 
+def cria_indice_partidos(info_eleicoes):
+    """Devolve o índice dos partidos que participaram nas eleições, construído
+    uma só vez. Permite verificar se um partido participou em tempo constante e
+    percorrer os partidos por ordem alfabética sem voltar a ordená-los.
+    Representação interna: {"partidos": tuplo ordenado, "posicoes": {partido: int}}
+
+    Args:
+        info_eleicoes (dict): informação sobre eleições num território
+
+    Returns:
+        dict: índice dos partidos
+    """
+    nomes = {}
+    for territorio in info_eleicoes:
+        for partido in info_eleicoes[territorio]["votos"]:
+            if partido not in nomes:
+                nomes[partido] = sys.intern(partido) if type(partido) == str else partido
+    partidos = tuple(sorted(nomes.values()))
+    return {"partidos": partidos, "posicoes": {partido: i for i, partido in enumerate(partidos)}}
+
+def eh_partido_do_indice(indice, partido):
+    """Devolve True se o partido pertence ao índice, e False caso contrário.
+
+    Args:
+        indice (dict): índice dos partidos
+        partido (str): nome do partido
+
+    Returns:
+        boolean: True ou False
+    """
+    return partido in indice["posicoes"]
+
+def obtem_posicao_partido(indice, partido):
+    """Devolve a posição do partido na ordem alfabética do índice.
+
+    Args:
+        indice (dict): índice dos partidos
+        partido (str): nome do partido
+
+    Returns:
+        int: posição do partido
+    """
+    return indice["posicoes"][partido]
+
+def obtem_partidos_indice(indice):
+    """Devolve o tuplo, por ordem alfabética, dos partidos do índice.
+
+    Args:
+        indice (dict): índice dos partidos
+
+    Returns:
+        tuple: partidos por ordem alfabética
+    """
+    return indice["partidos"]
+
 def obtem_partidos(info_eleicoes):
     """Obtém uma lista por ordem alfabetica com o nome de todos os 
     partidos que participaram nas eleições. 
@@ -144,30 +579,58 @@ def obtem_partidos(info_eleicoes):
     Returns:
         list: lista dos partidos que participaram nas eleições
     """    
-    partidos = []
-    for territorio in info_eleicoes:
-        for partido in info_eleicoes[territorio]["votos"]:
-            if partido not in partidos:
-                partidos += [partido]
-    return sorted(partidos)
+    return list(obtem_partidos_indice(cria_indice_partidos(info_eleicoes)))
 
-def metodo_hondt_erros(info_eleicoes):  
-    if type(info_eleicoes) != dict or info_eleicoes == {} or not all(type(key) == str\
-         for key in info_eleicoes.keys()):
+validacoes = OrderedDict()
+
+def metodo_hondt_erros(info_eleicoes, versao=None, max_validacoes=4):
+    """Verifica, numa única passagem e parando no primeiro erro, se a informação
+    sobre as eleições é válida. Se for dada uma versão, o resultado fica em cache
+    e validar de novo o mesmo dicionário com a mesma versão não custa nada.
+    A cache guarda os max_validacoes dicionários validados mais recentemente e
+    mantém-nos em memória (a referência impede que o id seja reutilizado por
+    outro dicionário) até serem substituídos ou até validacoes.clear().
+
+    Args:
+        info_eleicoes (dict): dicionário com informação sobre eleições num território
+        versao (universal, optional): versão do dicionário, alterada pelo chamador
+        sempre que o modifica
+        max_validacoes (int, optional): número máximo de dicionários guardados
+
+    Raises:
+        ValueError: Argumento inválido
+        ValueError: Argumentos inválidos (max_validacoes não é um inteiro positivo)
+
+    Returns:
+        dict: informação sobre as eleições
+    """
+    if type(max_validacoes) != int or max_validacoes < 1:
+        raise ValueError("metodo_hondt_erros: argumentos invalidos")
+    if versao is not None and validacoes.get(id(info_eleicoes), (None, None))[0] is\
+         info_eleicoes and validacoes[id(info_eleicoes)][1] == versao:
+        validacoes.move_to_end(id(info_eleicoes))
+        return info_eleicoes
+    if type(info_eleicoes) != dict or info_eleicoes == {}:
         raise ValueError("obtem_resultado_eleicoes: argumento invalido")
-    for territorio in info_eleicoes:
-        if type(info_eleicoes[territorio]) != dict or list(info_eleicoes[territorio].keys())\
-             != ["deputados", "votos"] or type(info_eleicoes[territorio]["votos"]) != dict or \
-                info_eleicoes[territorio]["votos"] == {} or type(info_eleicoes[territorio]\
-                    ["deputados"]) != int or info_eleicoes[territorio]["deputados"] < 1 or not\
-                        all(type(n) == int and n > 0 for n in list(info_eleicoes[territorio]\
-                            ["votos"].values())) or not all(type(partido) == str  for partido\
-                                in info_eleicoes[territorio]["votos"]):
+    for territorio, info_territorio in info_eleicoes.items():
+        if type(territorio) != str or type(info_territorio) != dict or len(info_territorio) != 2:
             raise ValueError("obtem_resultado_eleicoes: argumento invalido")
-    else:
-        return (info_eleicoes)
+        chaves = iter(info_territorio)
+        if next(chaves) != "deputados" or next(chaves) != "votos" or type(info_territorio\
+            ["deputados"]) != int or info_territorio["deputados"] < 1 or\
+                 type(info_territorio["votos"]) != dict or info_territorio["votos"] == {}:
+            raise ValueError("obtem_resultado_eleicoes: argumento invalido")
+        for partido, n in info_territorio["votos"].items():
+            if type(partido) != str or type(n) != int or n <= 0:
+                raise ValueError("obtem_resultado_eleicoes: argumento invalido")
+    if versao is not None:
+        validacoes.pop(id(info_eleicoes), None)
+        while len(validacoes) >= max_validacoes:
+            validacoes.popitem(last = False)
+        validacoes[id(info_eleicoes)] = (info_eleicoes, versao)
+    return info_eleicoes
         
-def obtem_resultado_eleicoes(info_eleicoes):
+def obtem_resultado_eleicoes(info_eleicoes, processos=None, versao=None):
     """Devolve a lista ordenada de comprimento igual ao número total de
     partidos com os resultados das eleições. Cada elemento da lista é
     um tuplo de tamanho 3 contendo o nome de um partido, o número total de
@@ -177,26 +640,151 @@ def obtem_resultado_eleicoes(info_eleicoes):
 
     Args:
         info_eleicoes (dict): dicionário com informação sobre eleições num território
+        processos (int, optional): número de processos pelos quais os territórios
+        são distribuídos; por omissão são tratados em série
+        versao (universal, optional): versão de info_eleicoes, usada para evitar
+        validar de novo um dicionário que não foi alterado
+
+    Raises:
+        ValueError: Argumento inválido
 
     Returns:
         list: lista dos partidos que participaram nas eleições e resultados obtidos
     """    
-    metodo_hondt_erros(info_eleicoes)
-    partidos = obtem_partidos(info_eleicoes)
-    deputados = votos = 0
-    resultados = []
-    for partido in partidos:         ##########  
-        for territorio in info_eleicoes:
-            mandatos = atribui_mandatos(info_eleicoes[territorio]["votos"], \
-                info_eleicoes[territorio]["deputados"])
-            if partido in mandatos or partido in (info_eleicoes[territorio]["votos"]):
-                deputados += mandatos.count(partido)
-                votos += info_eleicoes[territorio]["votos"][partido]
-        res_partido = (partido, deputados, votos)
-        deputados = votos = 0
-        resultados += [(res_partido)]
+    metodo_hondt_erros(info_eleicoes, versao)
+    indice = cria_indice_partidos(info_eleicoes)
+    if processos is None:
+        mandatos_territorios = (atribui_mandatos_heap(info_eleicoes[territorio]["votos"],\
+             info_eleicoes[territorio]["deputados"]) for territorio in info_eleicoes)
+        return agrega_resultados(info_eleicoes, mandatos_territorios, indice)
+    if type(processos) != int or processos < 1:
+        raise ValueError("obtem_resultado_eleicoes: argumento invalido")
+    bloco = max(1, len(info_eleicoes) // (processos * 4))
+    with ProcessPoolExecutor(max_workers = processos) as executor:
+        # map devolve os mandatos pela ordem dos territórios, logo a agregação é determinista
+        mandatos_territorios = executor.map(atribui_mandatos_heap, [info_eleicoes[territorio]\
+            ["votos"] for territorio in info_eleicoes], [info_eleicoes[territorio]["deputados"]\
+                 for territorio in info_eleicoes], chunksize = bloco)
+        return agrega_resultados(info_eleicoes, mandatos_territorios, indice)
+
+def agrega_resultados(info_eleicoes, mandatos_territorios, indice=None):
+    """Acumula, numa única passagem pelos territórios, os deputados e os votos
+    de cada partido e devolve a lista de resultados de obtem_resultado_eleicoes.
+
+    Args:
+        info_eleicoes (dict): dicionário com informação sobre eleições num território
+        mandatos_territorios (iterable): listas de mandatos de cada território,
+        pela mesma ordem dos territórios de info_eleicoes
+        indice (dict, optional): índice dos partidos de info_eleicoes
+
+    Returns:
+        list: lista dos partidos que participaram nas eleições e resultados obtidos
+    """
+    if indice is None:
+        indice = cria_indice_partidos(info_eleicoes)
+    deputados = [0] * len(obtem_partidos_indice(indice))
+    votos = [0] * len(deputados)
+    for territorio, mandatos in zip(info_eleicoes, mandatos_territorios):
+        for partido, n in info_eleicoes[territorio]["votos"].items():
+            votos[obtem_posicao_partido(indice, partido)] += n
+        for partido in mandatos:
+            deputados[obtem_posicao_partido(indice, partido)] += 1
+    resultados = [(partido, deputados[i], votos[i]) for i, partido in\
+         enumerate(obtem_partidos_indice(indice))]
     return(sorted(resultados, key = lambda x : x[2], reverse = True))
 
+def cria_resultados_eleicoes(info_eleicoes):
+    """Devolve um objeto com os resultados das eleições que pode ser atualizado
+    à medida que os votos de cada território vão sendo apurados.
+    Representação interna: {"territorios": {territorio: {"deputados": int,
+    "votos": dict, "mandatos": dict}}, "deputados": dict, "votos": dict,
+    "ordem": lista de (-votos, partido) ordenada}
+
+    Args:
+        info_eleicoes (dict): dicionário com informação sobre eleições num território
+
+    Raises:
+        ValueError: Argumento inválido
+
+    Returns:
+        dict: resultados das eleições
+    """
+    metodo_hondt_erros(info_eleicoes)
+    resultados = {"territorios": {}, "deputados": {}, "votos": {}, "ordem": []}
+    for territorio in info_eleicoes:
+        resultados["territorios"][territorio] = {"deputados": info_eleicoes[territorio]\
+            ["deputados"], "votos": dict(info_eleicoes[territorio]["votos"]), "mandatos": {}}
+        for partido, n in info_eleicoes[territorio]["votos"].items():
+            resultados["votos"][partido] = resultados["votos"].get(partido, 0) + n
+            resultados["deputados"].setdefault(partido, 0)
+        reparte_mandatos_territorio(resultados, territorio)
+    resultados["ordem"] = sorted((-n, partido) for partido, n in resultados["votos"].items())
+    return resultados
+
+def reparte_mandatos_territorio(resultados, territorio):
+    """Recalcula os mandatos de um território e atualiza os totais nacionais
+    de deputados de cada partido.
+
+    Args:
+        resultados (dict): resultados das eleições
+        territorio (str): território cujos votos foram alterados
+    """
+    info_territorio = resultados["territorios"][territorio]
+    for partido, n in info_territorio["mandatos"].items():
+        resultados["deputados"][partido] -= n
+    mandatos = {}
+    for partido in atribui_mandatos_heap(info_territorio["votos"], info_territorio["deputados"]):
+        mandatos[partido] = mandatos.get(partido, 0) + 1
+    for partido, n in mandatos.items():
+        resultados["deputados"][partido] += n
+    info_territorio["mandatos"] = mandatos
+
+def atualiza_votos(resultados, territorio, variacao):
+    """Modifica destrutivamente os resultados somando aos votos do território
+    as variações recebidas. Só os mandatos desse território são recalculados e
+    a ordenação nacional é corrigida apenas para os partidos alterados.
+
+    Args:
+        resultados (dict): resultados das eleições
+        territorio (str): território onde os votos foram apurados
+        variacao (dict): dicionário com a variação de votos de cada partido
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: resultados modificados
+    """
+    if type(variacao) != dict or territorio not in resultados["territorios"]:
+        raise ValueError("atualiza_votos: argumentos invalidos")
+    votos = resultados["territorios"][territorio]["votos"]
+    for partido, n in variacao.items():
+        if type(partido) != str or type(n) != int or votos.get(partido, 0) + n <= 0:
+            raise ValueError("atualiza_votos: argumentos invalidos")
+    ordem = resultados["ordem"]
+    for partido, n in variacao.items():
+        votos[partido] = votos.get(partido, 0) + n
+        if partido in resultados["votos"]:
+            del ordem[bisect.bisect_left(ordem, (-resultados["votos"][partido], partido))]
+        else:
+            resultados["votos"][partido] = resultados["deputados"][partido] = 0
+        resultados["votos"][partido] += n
+        bisect.insort(ordem, (-resultados["votos"][partido], partido))
+    reparte_mandatos_territorio(resultados, territorio)
+    return resultados
+
+def obtem_resultado(resultados):
+    """Devolve a lista de resultados atual, igual à que obtem_resultado_eleicoes
+    devolveria para os votos apurados até ao momento.
+
+    Args:
+        resultados (dict): resultados das eleições
+
+    Returns:
+        list: lista dos partidos que participaram nas eleições e resultados obtidos
+    """
+    return [(partido, resultados["deputados"][partido], -n) for n, partido in resultados["ordem"]]
+
 def produto_interno(vetor1, vetor2):
     """Calcula o produto interno de dois vetores com as mesmas dimensões.
 
@@ -292,31 +880,807 @@ def sistema_linear_erros(matriz, constantes, precisao):
     else:
         return(matriz, constantes, precisao)
        
-def resolve_sistema(matriz, constantes, precisao):
-    """Aplica o método de Jacobi ao cálculo da solução.
+def resolve_sistema(matriz, constantes, precisao, motor="python", metodo="jacobi", omega=1.0,\
+     diagnostico=False, solucao_inicial=None, max_iteracoes=None, tempo_maximo=None, processos=None):
+    """Aplica o método de Jacobi (ou, se pedido, o de Gauss-Seidel ou o de
+    sobre-relaxação sucessiva) ao cálculo da solução.
     
     Args:
-        matriz (tuple): tuplo de tuplos representando uma matriz quadrada
+        matriz (tuple): tuplo de tuplos representando uma matriz quadrada, ou
+        matriz esparsa criada por cria_matriz_esparsa
         constantes (tuple): tuple de números representando o vetor das constantes
         precisao (float): valor real positivo correspondente à precisão pretendida
+        motor (str, optional): "python", "numpy" para calcular cada iteração com um
+        só produto matriz-vetor, "array" para iterar sobre buffers pré-alocados, ou
+        "processos" para dividir as linhas por vários processos (estes três apenas
+        para matrizes densas)
+        metodo (str, optional): "jacobi", "gauss-seidel" ou "sor"; os dois últimos
+        apenas para matrizes densas com o motor "python"
+        omega (float, optional): fator de relaxação do método "sor", entre 0 e 2
+        diagnostico (bool, optional): se True, devolve também o diagnóstico
+        solucao_inicial (tuple, optional): solução a partir da qual se itera;
+        por omissão, o vetor nulo
+        max_iteracoes (int, optional): número máximo de iterações
+        tempo_maximo (float, optional): tempo máximo de resolução, em segundos
+        processos (int, optional): número de processos do motor "processos"; por
+        omissão, o número de CPUs
 
     Raises:
         ValueError: Matriz diagonal não dominante
         ValueError: Argumentos inválidos
+        ValueError: Sem convergência dentro dos limites, se diagnostico for False
     
     Returns:
         tuple: solução do sistema
+        dict: diagnóstico {"iteracoes": int, "residuo": float, "tempo": float,
+        "convergiu": bool}, apenas se diagnostico for True
     """    
-    sistema_linear_erros(matriz, constantes, precisao)
-    matriz_reord, constantes_reord = retira_zeros_diagonal(matriz, constantes)
-    if not eh_diagonal_dominante(matriz_reord):
-        raise ValueError("resolve_sistema: matriz nao diagonal dominante")
-    if coluna_nula(matriz_reord):
+    inicio = time.perf_counter()
+    if motor not in ("python", "numpy", "array", "processos") or metodo not in ("jacobi", "gauss-seidel",\
+         "sor") or type(omega) not in (int, float) or not 0 < omega < 2 or (eh_matriz_esparsa(matriz)\
+             and motor != "python") or (metodo != "jacobi" and (motor != "python" or\
+                 eh_matriz_esparsa(matriz))) or (max_iteracoes is not None and\
+                     (type(max_iteracoes) != int or max_iteracoes < 0)) or (tempo_maximo is not\
+                         None and (type(tempo_maximo) not in (int, float) or tempo_maximo <= 0))\
+                             or (processos is not None and (type(processos) != int or processos < 1)):
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    if eh_matriz_esparsa(matriz):
+        matriz_reord, constantes_reord = prepara_sistema_esparso(matriz, constantes, precisao)
+    else:
+        sistema_linear_erros(matriz, constantes, precisao)
+        matriz_reord, constantes_reord = retira_zeros_diagonal(matriz, constantes)
+        if not eh_diagonal_dominante(matriz_reord):
+            raise ValueError("resolve_sistema: matriz nao diagonal dominante")
+        if coluna_nula(matriz_reord):
+            raise ValueError("resolve_sistema: argumentos invalidos")
+    if solucao_inicial is not None and (type(solucao_inicial) != tuple or len(solucao_inicial)\
+         != len(constantes) or not all(type(xi) == int or type(xi) == float for xi in\
+             solucao_inicial)):
         raise ValueError("resolve_sistema: argumentos invalidos")
-    solucao = next_sol = [0] * len(matriz)
-    while not verifica_convergencia(matriz_reord, constantes_reord, solucao, precisao):
+    prazo = None if tempo_maximo is None else inicio + tempo_maximo
+    if eh_matriz_esparsa(matriz):
+        solucao, iteracoes, convergiu = jacobi_esparso(matriz_reord, constantes_reord, precisao,\
+             solucao_inicial, max_iteracoes, prazo)
+    elif motor == "numpy":
+        solucao, iteracoes, convergiu = jacobi_numpy(matriz_reord, constantes_reord, precisao,\
+             solucao_inicial, max_iteracoes, prazo)
+    elif motor == "processos":
+        solucao, iteracoes, convergiu = jacobi_processos(matriz_reord, constantes_reord, precisao,\
+             processos or os.cpu_count() or 1, solucao_inicial, max_iteracoes, prazo)
+    elif motor == "array":
+        solucao, iteracoes, convergiu = jacobi_array([array("d", linha) for linha in\
+            matriz_reord], array("d", (1 / matriz_reord[i][i] for i in range(len(matriz_reord)))),\
+                 constantes_reord, precisao, solucao_inicial, max_iteracoes, prazo)
+    elif metodo == "jacobi":
+        solucao, iteracoes, convergiu = jacobi(matriz_reord, constantes_reord, precisao,\
+             solucao_inicial, max_iteracoes, prazo)
+    else:
+        solucao, iteracoes, convergiu = gauss_seidel(matriz_reord, constantes_reord, precisao,\
+             omega if metodo == "sor" else 1.0, solucao_inicial, max_iteracoes, prazo)
+    if not diagnostico:
+        if not convergiu:
+            raise ValueError("resolve_sistema: sem convergencia")
+        return solucao
+    if eh_matriz_esparsa(matriz):
+        residuo = max(abs(float(sum(matriz_reord["valores"][k] * solucao[matriz_reord["colunas"]\
+            [k]] for k in range(matriz_reord["inicios"][i], matriz_reord["inicios"][i + 1]))) -\
+                 constantes_reord[i]) for i in range(len(solucao)))
+    else:
+        residuo = max(abs(produto_interno(matriz_reord[i], solucao) - constantes_reord[i]) for i\
+             in range(len(solucao)))
+    return solucao, {"iteracoes": iteracoes, "residuo": residuo, "tempo": time.perf_counter() -\
+         inicio, "convergiu": convergiu}
+
+def limite_atingido(iteracoes, max_iteracoes, prazo):
+    """Devolve True se o número máximo de iterações ou o prazo foram atingidos,
+    e False caso contrário.
+
+    Args:
+        iteracoes (int): número de iterações feitas
+        max_iteracoes (int): número máximo de iterações, ou None
+        prazo (float): instante limite de time.perf_counter, ou None
+
+    Returns:
+        boolean: True ou False
+    """
+    return (max_iteracoes is not None and iteracoes >= max_iteracoes) or (prazo is not None\
+         and time.perf_counter() >= prazo)
+
+def jacobi(matriz, constantes, precisao, solucao_inicial=None, max_iteracoes=None, prazo=None):
+    """Itera o método de Jacobi a partir da solução inicial (por omissão, o vetor
+    nulo) até à convergência ou até um dos limites ser atingido.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    solucao = next_sol = [0] * len(matriz) if solucao_inicial is None else list(solucao_inicial)
+    iteracoes = 0
+    while not verifica_convergencia(matriz, constantes, solucao, precisao):
+        if limite_atingido(iteracoes, max_iteracoes, prazo):
+            return tuple(solucao), iteracoes, False
         next_sol = [0] * len(matriz)
         for i in range(len(matriz)):
-            next_sol[i] += solucao[i] + (constantes_reord[i] - produto_interno(matriz_reord[i], solucao)) / matriz_reord[i][i]
+            next_sol[i] += solucao[i] + (constantes[i] - produto_interno(matriz[i], solucao)) / matriz[i][i]
         solucao = next_sol.copy()
-    return(tuple(solucao))
+        iteracoes += 1
+    return tuple(solucao), iteracoes, True
+
+def gauss_seidel(matriz, constantes, precisao, omega, solucao_inicial=None, max_iteracoes=None,\
+     prazo=None):
+    """Itera o método de sobre-relaxação sucessiva a partir da solução inicial (por
+    omissão, o vetor nulo) até à convergência ou até um dos limites ser atingido:
+    cada componente é atualizada no próprio vetor solução, usando logo os valores
+    já atualizados nessa iteração. Com omega = 1 é o método de Gauss-Seidel.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        omega (float): fator de relaxação
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    solucao = [0] * len(matriz) if solucao_inicial is None else list(solucao_inicial)
+    iteracoes = 0
+    while not verifica_convergencia(matriz, constantes, solucao, precisao):
+        if limite_atingido(iteracoes, max_iteracoes, prazo):
+            return tuple(solucao), iteracoes, False
+        for i in range(len(matriz)):
+            solucao[i] += omega * (constantes[i] - produto_interno(matriz[i], solucao)) / matriz[i][i]
+        iteracoes += 1
+    return tuple(solucao), iteracoes, True
+
+def jacobi_array(linhas, inverso_diagonal, constantes, precisao, solucao_inicial=None,\
+     max_iteracoes=None, prazo=None):
+    """Itera o método de Jacobi sem criar listas em cada iteração: a solução
+    atual e a seguinte ocupam dois arrays pré-alocados que trocam de papel no fim
+    de cada iteração, a diagonal é usada através do seu inverso e o resíduo de
+    cada linha serve para a atualização e para o teste de convergência, que deixa
+    de comparar resíduos assim que um deles excede a precisão.
+
+    Args:
+        linhas (list): linhas da matriz sem zeros na diagonal, como arrays
+        inverso_diagonal (array): inverso de cada elemento da diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    n = len(linhas)
+    constantes = array("d", constantes)
+    atual = array("d", bytes(8 * n)) if solucao_inicial is None else array("d", solucao_inicial)
+    seguinte = array("d", bytes(8 * n))
+    mul, iteracoes = operator.mul, 0
+    while True:
+        convergiu = True
+        for i in range(n):
+            residuo = constantes[i] - sum(map(mul, linhas[i], atual))
+            if convergiu and (residuo >= precisao or residuo <= -precisao):
+                convergiu = False
+            seguinte[i] = atual[i] + residuo * inverso_diagonal[i]
+        if convergiu:
+            return tuple(atual), iteracoes, True
+        if limite_atingido(iteracoes, max_iteracoes, prazo):
+            return tuple(atual), iteracoes, False
+        atual, seguinte = seguinte, atual
+        iteracoes += 1
+
+def jacobi_processos(matriz, constantes, precisao, n_processos, solucao_inicial=None,\
+     max_iteracoes=None, prazo=None):
+    """Itera o método de Jacobi dividindo as linhas em blocos contíguos, um por
+    processo. A matriz, as constantes, o inverso da diagonal e os dois vetores
+    solução ficam em memória partilhada, sem cópias entre processos. Em cada
+    iteração os processos sincronizam numa barreira e cada um deixa o maior
+    resíduo do seu bloco, sendo a convergência decidida pelo maior de todos.
+    Cada linha é calculada como em jacobi_array, pelo que a solução é a mesma.
+    Uma thread vigia os processos e, se algum terminar antes do fim, quebra a
+    barreira para que nenhuma espera fique bloqueada.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        n_processos (int): número de processos
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Raises:
+        ValueError: Falha de um dos processos
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    n = len(matriz)
+    n_processos = min(n_processos, n)
+    # dados: matriz, constantes, inverso da diagonal e dois vetores solução;
+    # controlo: [continuar, vetor solução atual] seguido do resíduo de cada processo
+    dados = SharedMemory(create = True, size = 8 * (n * n + 4 * n))
+    controlo = SharedMemory(create = True, size = 8 * (2 + n_processos))
+    barreira = Barrier(n_processos + 1)
+    vetores, estado = dados.buf.cast("d"), controlo.buf.cast("d")
+    trabalhadores, terminado = [], Event()
+    vigia = Thread(target = jacobi_processos_vigia, args = (trabalhadores, barreira, terminado))
+    try:
+        vetores[:n * n] = array("d", chain.from_iterable(matriz))
+        vetores[n * n:n * n + n] = array("d", constantes)
+        vetores[n * n + n:n * n + 2 * n] = array("d", (1 / matriz[i][i] for i in range(n)))
+        vetores[n * n + 2 * n:n * n + 3 * n] = array("d", bytes(8 * n) if solucao_inicial is None\
+             else solucao_inicial)
+        estado[0], estado[1] = 1, 0
+        for p in range(n_processos):
+            trabalhadores += [Process(target = jacobi_processo_aux, args = (dados.name,\
+                controlo.name, n, n * p // n_processos, n * (p + 1) // n_processos, p, barreira))]
+            trabalhadores[-1].start()
+        vigia.start()
+        iteracoes = 0
+        while True:
+            barreira.wait()
+            barreira.wait()
+            atual = int(estado[1])
+            convergiu = max(estado[2:2 + n_processos]) < precisao
+            if convergiu or limite_atingido(iteracoes, max_iteracoes, prazo):
+                inicio = n * n + (2 + atual) * n
+                return tuple(vetores[inicio:inicio + n]), iteracoes, convergiu
+            estado[1] = 1 - atual
+            iteracoes += 1
+    except BrokenBarrierError:
+        raise ValueError("resolve_sistema: falha num dos processos")
+    finally:
+        estado[0] = 0
+        try:
+            if not barreira.broken:
+                barreira.wait()
+        except BrokenBarrierError:
+            pass
+        terminado.set()
+        if vigia.is_alive():
+            vigia.join()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        vetores.release()
+        estado.release()
+        for memoria in (dados, controlo):
+            memoria.close()
+            memoria.unlink()
+
+def jacobi_processos_vigia(trabalhadores, barreira, terminado):
+    while not terminado.wait(0.05):
+        if any(trabalhador.exitcode is not None for trabalhador in trabalhadores):
+            barreira.abort()
+            return
+
+def jacobi_processo_aux(nome_dados, nome_controlo, n, inicio, fim, p, barreira):
+    dados, controlo = SharedMemory(name = nome_dados), SharedMemory(name = nome_controlo)
+    vetores, estado = dados.buf.cast("d"), controlo.buf.cast("d")
+    linhas = [vetores[i * n:(i + 1) * n] for i in range(inicio, fim)]
+    solucoes = (vetores[n * n + 2 * n:n * n + 3 * n], vetores[n * n + 3 * n:n * n + 4 * n])
+    base, mul = n * n, operator.mul
+    try:
+        while True:
+            barreira.wait()
+            if estado[0] == 0:
+                break
+            atual, seguinte = solucoes[int(estado[1])], solucoes[1 - int(estado[1])]
+            maior = 0.0
+            for i in range(inicio, fim):
+                residuo = vetores[base + i] - sum(map(mul, linhas[i - inicio], atual))
+                maior = max(maior, abs(residuo))
+                seguinte[i] = atual[i] + residuo * vetores[base + n + i]
+            estado[2 + p] = maior
+            barreira.wait()
+    except BrokenBarrierError:
+        pass
+    except BaseException:
+        barreira.abort()
+        raise
+    finally:
+        for vista in linhas + list(solucoes) + [vetores, estado]:
+            vista.release()
+        dados.close()
+        controlo.close()
+
+def jacobi_numpy(matriz, constantes, precisao, solucao_inicial=None, max_iteracoes=None,\
+     prazo=None):
+    """Itera o método de Jacobi com o NumPy: cada iteração é um único produto
+    matriz-vetor, cujo resíduo serve tanto para testar a convergência como para
+    atualizar a solução.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    import numpy as np
+    a, c = np.array(matriz, dtype = float), np.array(constantes, dtype = float)
+    diagonal, iteracoes = a.diagonal().copy(), 0
+    solucao = np.zeros(len(c)) if solucao_inicial is None else np.array(solucao_inicial, dtype = float)
+    while True:
+        residuo = c - a @ solucao
+        if (np.abs(residuo) < precisao).all():
+            return tuple(solucao.tolist()), iteracoes, True
+        if limite_atingido(iteracoes, max_iteracoes, prazo):
+            return tuple(solucao.tolist()), iteracoes, False
+        solucao += residuo / diagonal
+        iteracoes += 1
+
+def resolve_sistemas(matriz, bloco_constantes, precisao, motor="python"):
+    """Aplica o método de Jacobi a vários sistemas com a mesma matriz e vetores
+    de constantes diferentes. A validação e a reordenação da matriz são feitas
+    uma só vez e todos os sistemas são iterados em conjunto, deixando de ser
+    calculados assim que convergem.
+
+    Args:
+        matriz (tuple): tuplo de tuplos representando uma matriz quadrada
+        bloco_constantes (tuple): tuplo de vetores das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        motor (str, optional): "python", ou "numpy" para calcular cada iteração
+        com um só produto matriz-matriz
+
+    Raises:
+        ValueError: Matriz diagonal não dominante
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: tuplo com a solução de cada sistema
+    """
+    if motor not in ("python", "numpy") or type(bloco_constantes) != tuple or\
+         bloco_constantes == ():
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    sistema = cria_sistema_preparado(matriz)
+    sistema_linear_erros(matriz, bloco_constantes[0], precisao)
+    for constantes in bloco_constantes:
+        if type(constantes) != tuple or len(constantes) != len(matriz) or not all(type(ci) ==\
+             int or type(ci) == float for ci in constantes):
+            raise ValueError("resolve_sistema: argumentos invalidos")
+    matriz_reord, linhas = sistema["matriz"], sistema["linhas"]
+    bloco_reord = [tuple(constantes[linha] for linha in linhas) for constantes in bloco_constantes]
+    if motor == "numpy":
+        return jacobi_bloco_numpy(matriz_reord, bloco_reord, precisao)
+    return jacobi_bloco(matriz_reord, bloco_reord, precisao)
+
+def jacobi_bloco(matriz, bloco_constantes, precisao):
+    """Itera o método de Jacobi em simultâneo para todos os vetores de constantes,
+    retirando cada sistema assim que converge. Cada solução é igual à que
+    jacobi obteria para esse sistema.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        bloco_constantes (list): lista de vetores das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+
+    Returns:
+        tuple: tuplo com a solução de cada sistema
+    """
+    n = len(matriz)
+    solucoes, resultado = [[0] * n for constantes in bloco_constantes], [None] * len(bloco_constantes)
+    ativos = list(range(len(bloco_constantes)))
+    while ativos != []:
+        produtos = [[produto_interno(linha, solucoes[k]) for k in ativos] for linha in matriz]
+        restantes = []
+        for a, k in enumerate(ativos):
+            constantes = bloco_constantes[k]
+            if all(abs(produtos[i][a] - constantes[i]) < precisao for i in range(n)):
+                resultado[k] = tuple(solucoes[k])
+            else:
+                solucoes[k] = [solucoes[k][i] + (constantes[i] - produtos[i][a]) / matriz[i][i]\
+                     for i in range(n)]
+                restantes += [k]
+        ativos = restantes
+    return tuple(resultado)
+
+def jacobi_bloco_numpy(matriz, bloco_constantes, precisao):
+    """Versão de jacobi_bloco com o NumPy: cada iteração é um único produto entre
+    a matriz e a matriz das soluções ainda por convergir.
+
+    Args:
+        matriz (tuple): matriz sem zeros na diagonal
+        bloco_constantes (list): lista de vetores das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+
+    Returns:
+        tuple: tuplo com a solução de cada sistema
+    """
+    import numpy as np
+    a = np.array(matriz, dtype = float)
+    c = np.array(bloco_constantes, dtype = float).T
+    diagonal, resultado = a.diagonal().copy()[:, None], [None] * len(bloco_constantes)
+    ativos, solucoes = np.arange(c.shape[1]), np.zeros(c.shape)
+    while len(ativos) > 0:
+        residuos = c - a @ solucoes
+        convergidos = (np.abs(residuos) < precisao).all(axis = 0)
+        for k, solucao in zip(ativos[convergidos], solucoes[:, convergidos].T):
+            resultado[k] = tuple(solucao.tolist())
+        ativos, c = ativos[~convergidos], c[:, ~convergidos]
+        solucoes = solucoes[:, ~convergidos] + residuos[:, ~convergidos] / diagonal
+    return tuple(resultado)
+
+def cria_sistema_preparado(matriz):
+    """Valida a matriz e faz, uma só vez, a reordenação das linhas e as
+    verificações de resolve_sistema, guardando a matriz reordenada e o inverso
+    da diagonal em arrays para serem usados em várias resoluções.
+    Representação interna: {"matriz": tuplo de tuplos, "linhas": tuplo,
+    "valores": lista de arrays, "inverso_diagonal": array}
+
+    Args:
+        matriz (tuple): tuplo de tuplos representando uma matriz quadrada
+
+    Raises:
+        ValueError: Matriz diagonal não dominante
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: sistema preparado
+    """
+    if type(matriz) != tuple:
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    sistema_linear_erros(matriz, (0, ) * len(matriz), 1.0)
+    # as constantes passadas são as posições, para obter a permutação das linhas
+    matriz_reord, linhas = retira_zeros_diagonal(matriz, tuple(range(len(matriz))))
+    if not eh_diagonal_dominante(matriz_reord):
+        raise ValueError("resolve_sistema: matriz nao diagonal dominante")
+    if coluna_nula(matriz_reord) or any(matriz_reord[i][i] == 0 for i in range(len(matriz))):
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    return {"matriz": matriz_reord, "linhas": linhas, "valores": [array("d", linha) for linha\
+         in matriz_reord], "inverso_diagonal": array("d", (1 / matriz_reord[i][i] for i in\
+             range(len(matriz))))}
+
+def resolve_sistema_preparado(sistema, constantes, precisao):
+    """Aplica o método de Jacobi a um sistema preparado, validando apenas as
+    constantes e a precisão, com o núcleo sem alocações de jacobi_array.
+
+    Args:
+        sistema (dict): sistema preparado
+        constantes (tuple): tuple de números representando o vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: solução do sistema
+    """
+    n = len(sistema["linhas"])
+    if type(constantes) != tuple or len(constantes) != n or not all(type(ci) == int or\
+         type(ci) == float for ci in constantes) or type(precisao) != float or precisao <= 0:
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    return jacobi_array(sistema["valores"], sistema["inverso_diagonal"], [constantes[linha] for\
+         linha in sistema["linhas"]], precisao)[0]
+
+sistemas_preparados = OrderedDict()
+
+def obtem_sistema_preparado(matriz, max_sistemas=32):
+    """Devolve o sistema preparado para a matriz, reutilizando-o se a mesma
+    matriz já tiver sido preparada. São guardados os max_sistemas usados mais
+    recentemente, identificados pelo hash da matriz (e confirmados por igualdade).
+
+    Args:
+        matriz (tuple): tuplo de tuplos representando uma matriz quadrada
+        max_sistemas (int, optional): número máximo de sistemas guardados
+
+    Raises:
+        ValueError: Matriz diagonal não dominante
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: sistema preparado
+    """
+    if type(max_sistemas) != int or max_sistemas < 1:
+        raise ValueError("obtem_sistema_preparado: argumentos invalidos")
+    try:
+        sistema = sistemas_preparados.get(matriz)
+    except TypeError:
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    if sistema is None:
+        sistema = cria_sistema_preparado(matriz)
+        while len(sistemas_preparados) >= max_sistemas:
+            sistemas_preparados.popitem(last = False)
+        sistemas_preparados[matriz] = sistema
+    else:
+        sistemas_preparados.move_to_end(matriz)
+    return sistema
+
+def cria_matriz_esparsa(n, entradas):
+    """Devolve a matriz esparsa quadrada de dimensão n com as entradas dadas no
+    formato de coordenadas (linha, coluna, valor), com índices a começar em 0.
+    Entradas repetidas são somadas e valores nulos não são guardados.
+    Representação interna (CSR): {"dimensao": int, "valores": array, "colunas":
+    array, "inicios": array}, em que as entradas da linha i ocupam as posições
+    inicios[i] a inicios[i + 1] de valores e colunas, por ordem de coluna.
+
+    Args:
+        n (int): dimensão da matriz
+        entradas (iterable): tuplos (linha, coluna, valor)
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: matriz esparsa
+    """
+    if type(n) != int or n < 1:
+        raise ValueError("cria_matriz_esparsa: argumentos invalidos")
+    elementos = {}
+    for entrada in entradas:
+        if type(entrada) != tuple or len(entrada) != 3 or type(entrada[0]) != int or\
+             type(entrada[1]) != int or not (0 <= entrada[0] < n and 0 <= entrada[1] < n)\
+                 or type(entrada[2]) not in (int, float):
+            raise ValueError("cria_matriz_esparsa: argumentos invalidos")
+        elementos[entrada[:2]] = elementos.get(entrada[:2], 0) + entrada[2]
+    matriz = {"dimensao": n, "valores": array("d"), "colunas": array("l"),\
+         "inicios": array("l", [0] * (n + 1))}
+    for (i, j), valor in sorted(elementos.items()):
+        if valor != 0:
+            matriz["valores"].append(valor)
+            matriz["colunas"].append(j)
+            matriz["inicios"][i + 1] += 1
+    for i in range(n):
+        matriz["inicios"][i + 1] += matriz["inicios"][i]
+    return matriz
+
+def cria_matriz_csr(valores, colunas, inicios):
+    """Devolve a matriz esparsa dada no formato CSR: as entradas da linha i são
+    valores[inicios[i]:inicios[i + 1]], nas colunas colunas[inicios[i]:inicios[i + 1]].
+
+    Args:
+        valores (iterable): valores das entradas não nulas
+        colunas (iterable): coluna de cada entrada
+        inicios (iterable): posição da primeira entrada de cada linha, seguida
+        do número total de entradas
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: matriz esparsa
+    """
+    valores, colunas, inicios = list(valores), list(colunas), list(inicios)
+    if len(inicios) < 2 or inicios[0] != 0 or inicios[-1] != len(valores) or\
+         len(colunas) != len(valores) or not all(type(k) == int and inicios[i] <= k for i, k\
+             in enumerate(inicios[1:])):
+        raise ValueError("cria_matriz_esparsa: argumentos invalidos")
+    return cria_matriz_esparsa(len(inicios) - 1, [(i, colunas[k], valores[k]) for i in\
+         range(len(inicios) - 1) for k in range(inicios[i], inicios[i + 1])])
+
+def matriz_para_esparsa(matriz):
+    """Devolve a matriz esparsa com as mesmas entradas da matriz densa.
+
+    Args:
+        matriz (tuple): tuplo de tuplos representando uma matriz quadrada
+
+    Returns:
+        dict: matriz esparsa
+    """
+    return cria_matriz_esparsa(len(matriz), [(i, j, valor) for i, linha in enumerate(matriz)\
+         for j, valor in enumerate(linha) if valor != 0])
+
+def eh_matriz_esparsa(arg):
+    """Verifica se o argumento é uma matriz esparsa.
+
+    Args:
+        arg (universal): argumento
+
+    Returns:
+        boolean: True ou False
+    """
+    return type(arg) == dict and len(arg) == 4 and type(arg.get("dimensao")) == int and\
+         all(type(arg.get(chave)) == array for chave in ("valores", "colunas", "inicios"))\
+             and len(arg["inicios"]) == arg["dimensao"] + 1
+
+def obtem_elemento_esparso(matriz, i, j):
+    """Devolve o elemento da linha i e coluna j da matriz esparsa.
+
+    Args:
+        matriz (dict): matriz esparsa
+        i (int): linha
+        j (int): coluna
+
+    Returns:
+        float: elemento da matriz
+    """
+    for k in range(matriz["inicios"][i], matriz["inicios"][i + 1]):
+        if matriz["colunas"][k] == j:
+            return matriz["valores"][k]
+    return 0
+
+def reordena_linhas_esparsa(matriz, linhas):
+    """Devolve a matriz esparsa cuja linha i é a linha linhas[i] da matriz.
+
+    Args:
+        matriz (dict): matriz esparsa
+        linhas (list): nova ordem das linhas
+
+    Returns:
+        dict: matriz esparsa reordenada
+    """
+    valores, colunas, inicios = matriz["valores"], matriz["colunas"], matriz["inicios"]
+    nova = {"dimensao": matriz["dimensao"], "valores": array("d"), "colunas": array("l"),\
+         "inicios": array("l", [0])}
+    for linha in linhas:
+        nova["valores"].extend(valores[inicios[linha]:inicios[linha + 1]])
+        nova["colunas"].extend(colunas[inicios[linha]:inicios[linha + 1]])
+        nova["inicios"].append(len(nova["valores"]))
+    return nova
+
+def retira_zeros_diagonal_esparsa(matriz, constantes):
+    """Versão de retira_zeros_diagonal para matrizes esparsas: troca as linhas
+    com 0 na diagonal percorrendo apenas as entradas não nulas.
+
+    Args:
+        matriz (dict): matriz esparsa
+        constantes (tuple): tuplo de números representando o vetor das constantes
+
+    Returns:
+        dict: matriz de entrada reoordenada
+        tuple: vetor das constantes reoordenado
+    """
+    n = matriz["dimensao"]
+    linhas_coluna = [[] for j in range(n)]
+    for i in range(n):
+        for k in range(matriz["inicios"][i], matriz["inicios"][i + 1]):
+            linhas_coluna[matriz["colunas"][k]] += [i]
+    linhas, posicoes = list(range(n)), list(range(n))
+    for i in range(n):
+        if obtem_elemento_esparso(matriz, linhas[i], i) != 0:
+            continue
+        if linhas_coluna[i] == []:
+            return matriz, constantes
+        for j in sorted(posicoes[linha] for linha in linhas_coluna[i]):
+            if obtem_elemento_esparso(matriz, linhas[i], j) != 0:
+                linhas[i], linhas[j] = linhas[j], linhas[i]
+                posicoes[linhas[i]], posicoes[linhas[j]] = i, j
+                break
+    return reordena_linhas_esparsa(matriz, linhas), tuple(constantes[linha] for linha in linhas)
+
+def eh_diagonal_dominante_esparsa(matriz):
+    """Versão de eh_diagonal_dominante para matrizes esparsas.
+
+    Args:
+        matriz (dict): matriz esparsa
+
+    Returns:
+        boolean: True ou False
+    """
+    for i in range(matriz["dimensao"]):
+        linha = matriz["valores"][matriz["inicios"][i]:matriz["inicios"][i + 1]]
+        diagonal = abs(obtem_elemento_esparso(matriz, i, i))
+        if diagonal < sum([abs(num) for num in linha]) - diagonal:
+            return False
+    return True
+
+def coluna_nula_esparsa(matriz):
+    """Versão de coluna_nula para matrizes esparsas.
+
+    Args:
+        matriz (dict): matriz esparsa
+
+    Returns:
+        boolean: True ou False
+    """
+    return len(set(matriz["colunas"][k] for k in range(len(matriz["valores"])) if\
+         matriz["valores"][k] != 0)) < matriz["dimensao"]
+
+def sistema_esparso_erros(matriz, constantes, precisao):
+    if not eh_matriz_esparsa(matriz) or type(constantes) != tuple or len(constantes) !=\
+         matriz["dimensao"] or not all(type(ci) == int or type(ci) == float for ci in\
+             constantes) or type(precisao) != float or precisao <= 0:
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    n, valores, colunas, inicios = matriz["dimensao"], matriz["valores"], matriz["colunas"],\
+         matriz["inicios"]
+    # estrutura CSR: inícios crescentes a terminar no número de entradas, colunas
+    # dentro da matriz e por ordem crescente em cada linha, e nenhum valor nulo
+    if n < 1 or inicios[0] != 0 or inicios[-1] != len(valores) or len(colunas) != len(valores)\
+         or any(inicios[i] > inicios[i + 1] for i in range(n)) or any(not 0 <= coluna < n\
+             for coluna in colunas) or any(colunas[k] >= colunas[k + 1] for i in range(n) for k\
+                 in range(inicios[i], inicios[i + 1] - 1)) or any(valor == 0 for valor in valores):
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    return(matriz, constantes, precisao)
+
+def prepara_sistema_esparso(matriz, constantes, precisao):
+    """Valida o sistema com matriz esparsa e reordena-o de forma a não existirem
+    valores 0 na diagonal.
+
+    Args:
+        matriz (dict): matriz esparsa quadrada
+        constantes (tuple): tuple de números representando o vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+
+    Raises:
+        ValueError: Matriz diagonal não dominante
+        ValueError: Argumentos inválidos
+
+    Returns:
+        dict: matriz reordenada
+        tuple: vetor das constantes reordenado
+    """
+    sistema_esparso_erros(matriz, constantes, precisao)
+    matriz_reord, constantes_reord = retira_zeros_diagonal_esparsa(matriz, constantes)
+    if not eh_diagonal_dominante_esparsa(matriz_reord):
+        raise ValueError("resolve_sistema: matriz nao diagonal dominante")
+    if coluna_nula_esparsa(matriz_reord):
+        raise ValueError("resolve_sistema: argumentos invalidos")
+    return matriz_reord, constantes_reord
+
+def jacobi_esparso(matriz, constantes, precisao, solucao_inicial=None, max_iteracoes=None,\
+     prazo=None):
+    """Itera o método de Jacobi percorrendo apenas as entradas não nulas da matriz;
+    o produto de cada linha serve para testar a convergência e para a atualização.
+
+    Args:
+        matriz (dict): matriz esparsa sem zeros na diagonal
+        constantes (tuple): vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+        solucao_inicial (tuple, optional): solução inicial
+        max_iteracoes (int, optional): número máximo de iterações
+        prazo (float, optional): instante limite de time.perf_counter
+
+    Returns:
+        tuple: solução do sistema
+        int: número de iterações
+        boolean: True se convergiu, False caso contrário
+    """
+    n = matriz["dimensao"]
+    valores, colunas, inicios = matriz["valores"], matriz["colunas"], matriz["inicios"]
+    diagonal = [obtem_elemento_esparso(matriz, i, i) for i in range(n)]
+    solucao = [0] * n if solucao_inicial is None else list(solucao_inicial)
+    iteracoes = 0
+    while True:
+        produtos = [float(sum(valores[k] * solucao[colunas[k]] for k in range(inicios[i],\
+             inicios[i + 1]))) for i in range(n)]
+        if all(abs(produtos[i] - constantes[i]) < precisao for i in range(n)):
+            return tuple(solucao), iteracoes, True
+        if limite_atingido(iteracoes, max_iteracoes, prazo):
+            return tuple(solucao), iteracoes, False
+        solucao = [solucao[i] + (constantes[i] - produtos[i]) / diagonal[i] for i in range(n)]
+        iteracoes += 1
+
+def resolve_sistema_esparso(matriz, constantes, precisao):
+    """Aplica o método de Jacobi a um sistema com matriz esparsa, percorrendo em
+    cada iteração apenas as entradas não nulas.
+
+    Args:
+        matriz (dict): matriz esparsa quadrada
+        constantes (tuple): tuple de números representando o vetor das constantes
+        precisao (float): valor real positivo correspondente à precisão pretendida
+
+    Raises:
+        ValueError: Matriz diagonal não dominante
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: solução do sistema
+    """
+    matriz_reord, constantes_reord = prepara_sistema_esparso(matriz, constantes, precisao)
+    return jacobi_esparso(matriz_reord, constantes_reord, precisao)[0]
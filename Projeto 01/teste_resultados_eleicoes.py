@@ -0,0 +1,88 @@
+"""Teste de regressão de obtem_resultado_eleicoes: compara, em eleições geradas
+aleatoriamente, o resultado de projeto_1 com o da implementação original, que
+fica congelada neste ficheiro. Uma parte dos casos é também repartida por
+processos. Executar com: python teste_resultados_eleicoes.py
+"""
+import random
+import sys
+
+import projeto_1
+
+
+def calcula_quocientes_original(dict_votos, deputados):
+    quocientes = {}
+    for partido in dict_votos:
+        for num in range(1, deputados + 1):
+            if partido not in quocientes:
+                quocientes[partido] = [(dict_votos[partido] / num)]
+            else:
+                quocientes[partido] += [(dict_votos[partido] / num )]
+    return quocientes
+
+def atribui_mandatos_original(dict_votos, deputados):
+    mandatos = []
+    quocientes = calcula_quocientes_original(dict_votos, deputados)
+    for i in range(deputados):
+        votenum = 0
+        for partido in quocientes:
+            if quocientes[partido][0] > votenum:
+                votenum, partidocache = quocientes[partido][0], partido
+            if quocientes[partido][0] == votenum and dict_votos[partido] <=\
+                dict_votos[partidocache]:
+                    partidocache = partido
+        mandatos += [partidocache]
+        quocientes[partidocache].pop(0)
+    return mandatos
+
+def obtem_resultado_eleicoes_original(info_eleicoes):
+    partidos = sorted(set(partido for territorio in info_eleicoes for partido in\
+         info_eleicoes[territorio]["votos"]))
+    deputados = votos = 0
+    resultados = []
+    for partido in partidos:
+        for territorio in info_eleicoes:
+            mandatos = atribui_mandatos_original(info_eleicoes[territorio]["votos"], \
+                info_eleicoes[territorio]["deputados"])
+            if partido in mandatos or partido in (info_eleicoes[territorio]["votos"]):
+                deputados += mandatos.count(partido)
+                votos += info_eleicoes[territorio]["votos"][partido]
+        res_partido = (partido, deputados, votos)
+        deputados = votos = 0
+        resultados += [(res_partido)]
+    return(sorted(resultados, key = lambda x : x[2], reverse = True))
+
+def gera_eleicoes(gerador):
+    """Gera eleições aleatórias com poucos partidos e poucos votos, para que
+    haja empates nos quocientes e nos totais.
+    """
+    partidos = ["P%d" % i for i in range(gerador.randint(1, 8))]
+    info_eleicoes = {}
+    for t in range(gerador.randint(1, 6)):
+        votos = {}
+        for partido in gerador.sample(partidos, gerador.randint(1, len(partidos))):
+            votos[partido] = gerador.randint(1, gerador.choice([5, 50, 5000]))
+        info_eleicoes["T%d" % t] = {"deputados": gerador.randint(1, 12), "votos": votos}
+    return info_eleicoes
+
+def main(n_casos=1000, semente=2022, intervalo_processos=50):
+    gerador = random.Random(semente)
+    for caso in range(n_casos):
+        info_eleicoes = gera_eleicoes(gerador)
+        esperado = obtem_resultado_eleicoes_original(info_eleicoes)
+        obtido = projeto_1.obtem_resultado_eleicoes(info_eleicoes)
+        if caso % intervalo_processos == 0 and obtido == esperado:
+            obtido = projeto_1.obtem_resultado_eleicoes(info_eleicoes, processos = 2)
+        if obtido != esperado:
+            print("caso %d: %r\nesperado %r\nobtido   %r" % (caso, info_eleicoes, esperado, obtido))
+            return 1
+        for territorio in info_eleicoes:
+            votos, deputados = info_eleicoes[territorio]["votos"], info_eleicoes[territorio]["deputados"]
+            if projeto_1.atribui_mandatos_heap(votos, deputados) != atribui_mandatos_original(votos,\
+                 deputados):
+                print("caso %d, %s: atribui_mandatos_heap difere" % (caso, territorio))
+                return 1
+    print("ok: %d eleicoes" % n_casos)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
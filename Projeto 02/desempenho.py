@@ -0,0 +1,111 @@
+"""Medições de desempenho de projeto_2: representação do campo em dicionário
+(cria_campo) vs compacta (cria_campo_compacto). Executar com:
+
+    python desempenho.py [medicao ...]
+
+Sem argumentos corre todas as medições.
+"""
+import sys
+import time
+import tracemalloc
+
+import projeto_2
+
+CAMPOS = (("E", 5), ("J", 20), ("M", 50), ("Z", 99))
+REPRESENTACOES = (("dict", projeto_2.cria_campo), ("compacto", projeto_2.cria_campo_compacto))
+
+
+def mede(funcao, *args, minimo=0.2):
+    """Devolve o melhor tempo, em segundos, de uma chamada a funcao(*args),
+    repetindo-a até acumular pelo menos minimo segundos.
+    """
+    melhor, total = float("inf"), 0.0
+    while total < minimo:
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempo = time.perf_counter() - inicio
+        melhor, total = min(melhor, tempo), total + tempo
+    return melhor
+
+def mede_memoria(funcao, *args):
+    """Devolve a memória, em bytes, registada pelo tracemalloc que continua
+    ocupada pelo resultado de funcao(*args).
+    """
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    resultado = funcao(*args)
+    ocupada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del resultado
+    return ocupada
+
+def centro(c, l):
+    return projeto_2.cria_coordenada(chr((ord(c) + ord("A")) // 2), (l + 1) // 2)
+
+def jogo(m, c, n):
+    """Um ciclo de jogo sobre uma cópia do campo m: coloca n minas evitando a
+    coordenada c, limpa a partir de c e desenha o campo.
+    """
+    m = projeto_2.cria_copia_campo(m)
+    projeto_2.coloca_minas(m, c, projeto_2.cria_gerador(32, 1), n)
+    projeto_2.limpa_campo(m, c)
+    return projeto_2.campo_para_str(m)
+
+def consultas(m):
+    """Percorre todas as parcelas do campo m consultando o estado e o número de
+    minas vizinhas, como campo_para_str e limpa_campo fazem.
+    """
+    for l in range(1, projeto_2.obtem_ultima_linha(m) + 1):
+        for c in range(ord("A"), ord(projeto_2.obtem_ultima_coluna(m)) + 1):
+            coordenada = projeto_2.cria_coordenada(chr(c), l)
+            parcela = projeto_2.obtem_parcela(m, coordenada)
+            if projeto_2.eh_parcela_tapada(parcela) or projeto_2.eh_parcela_minada(parcela):
+                projeto_2.obtem_numero_minas_vizinhas(m, coordenada)
+
+def desempenho_memoria():
+    print("memoria ocupada pelo campo (tracemalloc)")
+    print("%7s %14s %14s %9s" % ("campo", "dict", "compacto", "razao"))
+    for c, l in CAMPOS:
+        dicionario, compacto = (mede_memoria(cria, c, l) for _, cria in REPRESENTACOES)
+        print("%3s x%2d %12d B %12d B %8.0fx" % (c, l, dicionario, compacto, dicionario / compacto))
+
+def desempenho_jogo():
+    print("ciclo de jogo (copia, coloca_minas, limpa_campo, campo_para_str)")
+    print("%7s %6s %16s %16s %9s" % ("campo", "minas", "dict (j/s)", "compacto (j/s)", "razao"))
+    for c, l in CAMPOS:
+        n = (ord(c) - ord("A") + 1) * l // 6
+        tempos = [mede(jogo, cria(c, l), centro(c, l), n) for _, cria in REPRESENTACOES]
+        print("%3s x%2d %6d %16.1f %16.1f %8.2fx" % (c, l, n, 1 / tempos[0], 1 / tempos[1],\
+             tempos[0] / tempos[1]))
+
+def desempenho_consultas():
+    print("consultas por parcela (obtem_parcela, eh_parcela_*, obtem_numero_minas_vizinhas)")
+    print("%7s %16s %16s %9s" % ("campo", "dict (p/s)", "compacto (p/s)", "razao"))
+    for c, l in CAMPOS:
+        parcelas = (ord(c) - ord("A") + 1) * l
+        campos = []
+        for _, cria in REPRESENTACOES:
+            m = cria(c, l)
+            projeto_2.coloca_minas(m, centro(c, l), projeto_2.cria_gerador(32, 1), parcelas // 6)
+            campos += [m]
+        tempos = [mede(consultas, m) for m in campos]
+        print("%3s x%2d %16.0f %16.0f %8.2fx" % (c, l, parcelas / tempos[0], parcelas / tempos[1],\
+             tempos[0] / tempos[1]))
+
+
+MEDICOES = {"memoria": desempenho_memoria, "jogo": desempenho_jogo,\
+     "consultas": desempenho_consultas}
+
+def main(argv):
+    nomes = argv or list(MEDICOES)
+    for nome in nomes:
+        if nome not in MEDICOES:
+            print("medicao desconhecida: %s (disponiveis: %s)" % (nome, ", ".join(MEDICOES)))
+            return 1
+    for nome in nomes:
+        MEDICOES[nome]()
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,3 +1,6 @@
+from collections import deque
+
+
 ### TAD gerador ###
 
 #construtores
@@ -261,6 +264,60 @@ def str_para_coordenada(s):
 
 
 #funções de alto nível
+tabelas_vizinhas = {}
+
+
+def obtem_tabela_vizinhas(c, l):
+    """Devolve a tabela de coordenadas vizinhas de um campo cuja última coluna
+    é c e cuja última linha é l. A tabela é construída uma única vez por
+    dimensão e partilhada por todos os campos com essa dimensão.
+
+    Args:
+        c (str): última coluna do campo
+        l (int): última linha do campo
+
+    Returns:
+        dict: dicionário cujas chaves são as coordenadas do campo e os valores
+        são os tuplos com as coordenadas vizinhas dentro do campo, começando pela
+        diagonal acima-esquerda e seguindo no sentido horário
+    """
+    if (c, l) not in tabelas_vizinhas:
+        tabela = {}
+        for coluna in range(ord("A"), ord(c) + 1):
+            for linha in range(1, l + 1):
+                tabela[cria_coordenada(chr(coluna), linha)] = tuple(cria_coordenada(chr(coluna\
+                     + i), linha + j) for i, j in ((-1, -1), (0, -1), (1, -1), (1, 0), (1, 1),\
+                         (0, 1), (-1, 1), (-1, 0)) if ord("A") <= coluna + i <= ord(c) and\
+                             1 <= linha + j <= l)
+        tabelas_vizinhas[(c, l)] = tabela
+    return tabelas_vizinhas[(c, l)]
+
+
+tabelas_indices_vizinhas = {}
+
+
+def obtem_tabela_indices_vizinhas(c, l):
+    """Devolve a tabela de vizinhas de obtem_tabela_vizinhas expressa em
+    posições no bytearray de um campo compacto cuja última coluna é c e cuja
+    última linha é l. Tal como a tabela de coordenadas, é construída uma única
+    vez por dimensão.
+
+    Args:
+        c (str): última coluna do campo
+        l (int): última linha do campo
+
+    Returns:
+        tuple: tuplo em que a posição de cada parcela guarda o tuplo com as
+        posições das suas vizinhas dentro do campo
+    """
+    if (c, l) not in tabelas_indices_vizinhas:
+        tabela, colunas = obtem_tabela_vizinhas(c, l), ord(c) - ord("A") + 1
+        tabelas_indices_vizinhas[(c, l)] = tuple(tuple((obtem_linha(vizinha) - 1) * colunas +\
+             ord(obtem_coluna(vizinha)) - ord("A") for vizinha in tabela[cria_coordenada(chr(ord("A")\
+                 + i % colunas), i // colunas + 1)]) for i in range(colunas * l))
+    return tabelas_indices_vizinhas[(c, l)]
+
+
 def obtem_coordenadas_vizinhas(c):
     """Devolve um tuplo com as coordenadas vizinhas à coordenada,
      começando pela coordenada na diagonal acima-esquerda e seguindo no sentido horário.
@@ -271,16 +328,7 @@ def obtem_coordenadas_vizinhas(c):
     Returns:
         tuple: tuplo com as coordenadas vizinhas à coordenada c
     """
-    coord_vizinhas = ()
-    for coluna, linha in [(ord(obtem_coluna(c)) + i, obtem_linha(c) + j) for i, j \
-        in ((-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0))]:
-        try:
-            cria_coordenada(chr(coluna), linha)
-        except:
-            coord_vizinhas += ()
-        else:
-            coord_vizinhas += (cria_coordenada(chr(coluna), linha),)
-    return coord_vizinhas
+    return obtem_tabela_vizinhas("Z", 99)[c]
 
 
 def obtem_coordenada_aleatoria(c, g): 
@@ -303,6 +351,9 @@ def obtem_coordenada_aleatoria(c, g):
 
 #contrutores
 #representação interna: {"estado": "tapada", "mina": False}
+#representação compacta: (campo compacto, TAD coordenada), em que o byte da
+#parcela no campo guarda o estado nos bits 0-1 (0 tapada, 1 marcada, 2 limpa),
+#a mina no bit 2 e o número de minas vizinhas nos bits 3-6
 def cria_parcela():
     """(Operação básica) Devolve uma parcela tapada sem mina escondida.
 
@@ -313,6 +364,26 @@ def cria_parcela():
     return {"estado": "tapada", "mina": False}
 
 
+def cria_parcela_compacta(m, c):
+    """Devolve a parcela que se encontra na coordenada c de um campo na
+    representação compacta.
+
+    Args:
+        m (tuple): campo compacto
+        c (TAD coordenada): coordenada
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: parcela formada pelo campo, pela coordenada e pela posição do
+        byte da parcela no campo
+    """
+    if not eh_coordenada_do_campo(m, c):
+        raise ValueError("cria_parcela_compacta: argumentos invalidos")
+    return (m, c, obtem_indice_coordenada(m, c))
+
+
 def cria_copia_parcela(p):
     """(Operação básica) Recebe uma parcela e devolve uma cópia nova da parcela.
 
@@ -322,10 +393,77 @@ def cria_copia_parcela(p):
     Returns:
         dict: cópia da parcela
     """
+    if type(p) != dict:
+        return parcela_para_dict(p)
     return p.copy()
 
 
+#seletores
+def obtem_campo_parcela(p):
+    """Devolve o campo compacto a que pertence a parcela compacta.
+
+    Args:
+        p (tuple): parcela compacta
+
+    Returns:
+        tuple: campo compacto
+    """
+    return p[0]
+
+
+def obtem_coordenada_parcela(p):
+    """Devolve a coordenada da parcela compacta no seu campo.
+
+    Args:
+        p (tuple): parcela compacta
+
+    Returns:
+        TAD coordenada: coordenada da parcela
+    """
+    return p[1]
+
+
+def obtem_indice_parcela(p):
+    """Devolve a posição do byte da parcela compacta no bytearray do seu campo.
+
+    Args:
+        p (tuple): parcela compacta
+
+    Returns:
+        int: posição do byte da parcela
+    """
+    return p[2]
+
+
+def obtem_celula_parcela(p):
+    """Devolve o byte que guarda o estado da parcela compacta, lido na posição
+    calculada ao criar a parcela.
+
+    Args:
+        p (tuple): parcela compacta
+
+    Returns:
+        int: byte da parcela
+    """
+    return p[0][2][p[2]]
+
+
 #modificadores
+def define_celula_parcela(p, celula):
+    """Modifica destrutivamente o byte que guarda o estado da parcela compacta,
+    e devolve a própria parcela.
+
+    Args:
+        p (tuple): parcela compacta
+        celula (int): novo byte da parcela
+
+    Returns:
+        tuple: parcela p modificada
+    """
+    p[0][2][p[2]] = celula
+    return p
+
+
 def limpa_parcela(p):
     """(Operação básica) Modifica destrutivamente a parcela modificando o seu
     estado para limpa, e devolve a própria parcela.
@@ -336,6 +474,8 @@ def limpa_parcela(p):
     Returns:
         dict: parcela p modificada
     """
+    if type(p) != dict:
+        return define_celula_parcela(p, obtem_celula_parcela(p) & ~3 | 2)
     p["estado"] = "limpa"
     return p
 
@@ -350,6 +490,8 @@ def marca_parcela(p):
     Returns:
         dict: parcela p modificada
     """
+    if type(p) != dict:
+        return define_celula_parcela(p, obtem_celula_parcela(p) & ~3 | 1)
     p["estado"] = "marcada"
     return p
 
@@ -364,6 +506,8 @@ def desmarca_parcela(p):
     Returns:
         dict: parcela p modificada
     """
+    if type(p) != dict:
+        return define_celula_parcela(p, obtem_celula_parcela(p) & ~3)
     p["estado"] = "tapada"
     return p
 
@@ -378,6 +522,14 @@ def esconde_mina(p):
     Returns:
         dict: parcela p modificada
     """
+    if type(p) != dict:
+        if not obtem_celula_parcela(p) & 4:
+            define_celula_parcela(p, obtem_celula_parcela(p) | 4)
+            m = obtem_campo_parcela(p)
+            for indice in obtem_tabela_indices_vizinhas(obtem_ultima_coluna(m),\
+                 obtem_ultima_linha(m))[obtem_indice_parcela(p)]:
+                m[2][indice] += 8
+        return p
     p["mina"] = True
     return p
 
@@ -392,6 +544,11 @@ def eh_parcela(arg):
     Returns:
         boolean: True ou False
     """
+    if type(arg) == tuple:
+        return len(arg) == 3 and type(arg[0]) == tuple and len(arg[0]) == 3 and\
+             type(arg[0][2]) == bytearray and eh_coordenada_do_campo(arg[0], arg[1]) and\
+                 arg[2] == obtem_indice_coordenada(arg[0], arg[1]) and\
+                     obtem_celula_parcela(arg) & 3 != 3
     return type(arg) == dict and len(arg) == 2 and "estado" in arg and (arg["estado"] ==\
          "tapada" or arg["estado"] == "marcada" or arg["estado"] =="limpa") and "mina" in arg\
              and (arg["mina"] == True or arg["mina"] == False)
@@ -407,6 +564,8 @@ def eh_parcela_tapada(p):
     Returns:
         boolean: True ou False
     """
+    if type(p) == tuple:
+        return obtem_celula_parcela(p) & 3 == 0
     return eh_parcela(p) and p["estado"] == "tapada"
 
 
@@ -420,6 +579,8 @@ def eh_parcela_marcada(p):
     Returns:
         boolean: True ou False
     """
+    if type(p) == tuple:
+        return obtem_celula_parcela(p) & 3 == 1
     return eh_parcela(p) and p["estado"] == "marcada"
 
 
@@ -433,6 +594,8 @@ def eh_parcela_limpa(p):
     Returns:
         boolean: True ou False
     """
+    if type(p) == tuple:
+        return obtem_celula_parcela(p) & 3 == 2
     return eh_parcela(p) and p["estado"] == "limpa"
 
 
@@ -446,6 +609,8 @@ def eh_parcela_minada(p):
     Returns:
         boolean: True ou False
     """
+    if type(p) == tuple:
+        return obtem_celula_parcela(p) & 4 == 4
     return eh_parcela(p) and p["mina"] ==  True
 
 
@@ -460,10 +625,25 @@ def parcelas_iguais(p1, p2):
     Returns:
         boolean: True ou False
     """
-    return p1 == p2
+    return parcela_para_dict(p1) == parcela_para_dict(p2)
+
+
+#transformadores
+def parcela_para_dict(p):
+    """Devolve a parcela na representação interna de dicionário.
+
+    Args:
+        p (dict): parcela
+
+    Returns:
+        dict: parcela cujas chaves são "estado" e "mina"
+    """
+    if type(p) == dict:
+        return p
+    celula = obtem_celula_parcela(p)
+    return {"estado": ("tapada", "marcada", "limpa")[celula & 3], "mina": celula & 4 == 4}
 
 
-#transformador
 def parcela_para_str(p):
     """(Operação básica) Devolve a cadeia de caracteres que representa a parcela
     em função do seu estado: parcelas tapadas ("#"), parcelas marcadas ("@"),
@@ -475,6 +655,8 @@ def parcela_para_str(p):
     Returns:
         str: cadeia de caracteres que representa a parcela
     """
+    if type(p) == tuple:
+        return "#@? #@X"[obtem_celula_parcela(p) & 7]  # bits de estado e de mina
     if p["estado"] == "tapada":
         return "#"
     elif p["estado"] == "marcada":
@@ -537,6 +719,30 @@ def cria_campo(c, l):
     return campo                           
 
 
+#representação compacta: (c, l, bytearray), em que a parcela na coordenada
+#(col, lin) ocupa o byte de índice (lin - 1) * número de colunas + (col - "A")
+def cria_campo_compacto(c, l):
+    """Recebe uma cadeia de carateres e um inteiro correspondentes à última
+    coluna e à última linha de um campo de minas, e devolve o campo do tamanho
+    pretendido na representação compacta, formado por parcelas tapadas sem minas.
+
+    Args:
+        c (str): última coluna do campo
+        l (int): última linha do campo
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: campo de minas formado pela última coluna, pela última linha
+        e pelo bytearray com as parcelas.
+    """
+    if not(type(c) == str and c in [chr(i) for i in range(ord("A"), ord("Z") + 1)]\
+         and type(l) == int and 1 <= l <= 99):
+         raise ValueError("cria_campo: argumentos invalidos")
+    return (c, l, bytearray((ord(c) - ord("A") + 1) * l))
+
+
 def cria_copia_campo(m):
     """(Operação básica) Recebe um campo e devolve uma cópia nova do campo.
 
@@ -546,6 +752,8 @@ def cria_copia_campo(m):
     Returns:
         dict: cópia do campo
     """
+    if type(m) == tuple:
+        return (m[0], m[1], bytearray(m[2]))
     m_copia = cria_campo(obtem_ultima_coluna(m), obtem_ultima_linha(m))
     for coordenada in m:
             m_copia[coordenada] = cria_copia_parcela(obtem_parcela(m, coordenada))
@@ -563,7 +771,9 @@ def obtem_ultima_coluna(m):
     Returns:
         str: última coluna do campo de minas
     """
-    return obtem_coluna(list(m)[-1])
+    if type(m) == tuple:
+        return m[0]
+    return obtem_coluna(next(reversed(m)))
 
 
 def obtem_ultima_linha(m):
@@ -576,7 +786,9 @@ def obtem_ultima_linha(m):
     Returns:
         int: última linha do campo de minas
     """
-    return obtem_linha(list(m)[-1])
+    if type(m) == tuple:
+        return m[1]
+    return obtem_linha(next(reversed(m)))
 
 
 def obtem_parcela(m, c):
@@ -590,9 +802,44 @@ def obtem_parcela(m, c):
     Returns:
         TAD parcela: parcela que se encontra na coordenada c
     """
+    if type(m) == tuple:
+        return cria_parcela_compacta(m, c)
     return m[c]
 
 
+def obtem_indice_coordenada(m, c):
+    """Devolve a posição, no bytearray de um campo compacto, do byte da parcela
+    na coordenada c.
+
+    Args:
+        m (tuple): campo compacto
+        c (TAD coordenada): coordenada do campo
+
+    Returns:
+        int: posição do byte da parcela
+    """
+    return (obtem_linha(c) - 1) * (ord(obtem_ultima_coluna(m)) - ord("A") + 1) +\
+         ord(obtem_coluna(c)) - ord("A")
+
+
+def obtem_celula(m, c):
+    """Devolve o byte da parcela na coordenada c de um campo compacto.
+
+    Args:
+        m (tuple): campo compacto
+        c (TAD coordenada): coordenada
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        int: byte da parcela
+    """
+    if not eh_coordenada_do_campo(m, c):
+        raise ValueError("obtem_celula: argumentos invalidos")
+    return m[2][obtem_indice_coordenada(m, c)]
+
+
 def obtem_coordenadas(m, s):
     """(Operação básica) Devolve o tuplo formado pelas coordenadas ordenadas em 
     ordem ascendente de esquerda à direita e de cima a baixo das parcelas
@@ -607,6 +854,11 @@ def obtem_coordenadas(m, s):
     Returns:
         tuple: tuplo formado pelas coordenadas ordenadas
     """
+    if type(m) == tuple:
+        colunas = ord(m[0]) - ord("A") + 1
+        mascara, valor = {"limpas": (3, 2), "tapadas": (3, 0), "marcadas": (3, 1)}.get(s, (4, 4))
+        return tuple(cria_coordenada(chr(ord("A") + i % colunas), i // colunas + 1) for i,\
+             celula in enumerate(m[2]) if celula & mascara == valor)
     if s == "limpas":
         coordenadas = [coordenada for coordenada in m if eh_parcela_limpa(obtem_parcela(m, coordenada))]
     elif s == "tapadas":
@@ -630,14 +882,41 @@ def obtem_numero_minas_vizinhas(m, c):
     Returns:
         int: número de parcelas vizinhas que escondem uma mina
     """
-    vizinhas = obtem_coordenadas_vizinhas(c)
+    if not eh_coordenada_do_campo(m, c):
+        return len([coordenada for coordenada in obtem_coordenadas_vizinhas(c) if\
+             eh_coordenada_do_campo(m, coordenada) and eh_parcela_minada(obtem_parcela(m, coordenada))])
+    if type(m) == tuple:
+        return m[2][obtem_indice_coordenada(m, c)] >> 3
+    vizinhas = obtem_tabela_vizinhas(obtem_ultima_coluna(m), obtem_ultima_linha(m))[c]
     contador = 0
     for coordenada in vizinhas:
-        if eh_coordenada_do_campo(m, coordenada) and eh_parcela_minada(m[coordenada]):
+        if eh_parcela_minada(obtem_parcela(m, coordenada)):
             contador += 1
     return contador
 
 
+#modificadores
+def define_celula(m, c, celula):
+    """Modifica destrutivamente o byte da parcela na coordenada c de um campo
+    compacto, e devolve o próprio campo.
+
+    Args:
+        m (tuple): campo compacto
+        c (TAD coordenada): coordenada
+        celula (int): novo byte da parcela
+
+    Raises:
+        ValueError: Argumentos inválidos
+
+    Returns:
+        tuple: campo m modificado
+    """
+    if not eh_coordenada_do_campo(m, c):
+        raise ValueError("define_celula: argumentos invalidos")
+    m[2][obtem_indice_coordenada(m, c)] = celula
+    return m
+
+
 #reconhecedores
 def eh_campo(arg):
     """(Operação básica) Verifica se o argumento é um TAD campo.
@@ -648,6 +927,11 @@ def eh_campo(arg):
     Returns:
         boolean: True ou False
     """
+    if type(arg) == tuple:
+        return len(arg) == 3 and type(arg[0]) == str and len(arg[0]) == 1 and "A" <= arg[0]\
+             <= "Z" and type(arg[1]) == int and 1 <= arg[1] <= 99 and type(arg[2]) ==\
+                 bytearray and len(arg[2]) == (ord(arg[0]) - ord("A") + 1) * arg[1] and\
+                     all(celula & 3 != 3 and celula >> 3 <= 8 for celula in arg[2])
     return type(arg) == dict and len(arg) >= 1 and all(eh_coordenada(coordenada) \
         for coordenada in arg) and all(eh_parcela(arg[coordenada]) for coordenada in arg)
 
@@ -663,6 +947,9 @@ def eh_coordenada_do_campo(m, c):
     Returns:
         boolean: True ou False
     """
+    if type(m) == tuple:
+        return eh_coordenada(c) and obtem_coluna(c) <= obtem_ultima_coluna(m) and\
+             obtem_linha(c) <= obtem_ultima_linha(m)
     return eh_coordenada(c) and c in m.keys()
 
 
@@ -677,6 +964,13 @@ def campos_iguais(m1, m2):
     Returns:
         boolean: True ou False
     """
+    if type(m1) == tuple and type(m2) == tuple:
+        return m1[0] == m2[0] and m1[1] == m2[1] and m1[2] == m2[2]
+    if type(m1) == tuple or type(m2) == tuple:
+        return obtem_ultima_coluna(m1) == obtem_ultima_coluna(m2) and obtem_ultima_linha(m1) ==\
+             obtem_ultima_linha(m2) and all(parcelas_iguais(obtem_parcela(m1, coordenada),\
+                 obtem_parcela(m2, coordenada)) for coordenada in obtem_tabela_vizinhas(\
+                     obtem_ultima_coluna(m1), obtem_ultima_linha(m1)))
     chaves_m1 = sorted(list(m1.keys()))
     chaves_m2 = sorted(list(m2.keys()))
     return len(m1) == len(m2) and m1.keys() == m2.keys() and all(coordenadas_iguais(chaves_m1[i],\
@@ -686,17 +980,24 @@ def campos_iguais(m1, m2):
 
 #transformadores
 def campo_para_str_aux(m):
+    if type(m) == tuple:
+        colunas, campo = ord(obtem_ultima_coluna(m)) - ord("A") + 1, ""
+        for i in range(obtem_ultima_linha(m)):
+            for celula in m[2][i * colunas:(i + 1) * colunas]:
+                parcela = "#@? #@X"[celula & 7]
+                campo += parcela if parcela != "?" else str(celula >> 3) if celula >> 3 else " "
+            campo += "|\n%0.2d|" %(i + 2)
+        return campo
     campo = ""
     for i in range(1, obtem_ultima_linha(m) + 1):
         for j in range(ord("A"), ord(obtem_ultima_coluna(m)) + 1):
-            if parcela_para_str(obtem_parcela(m, cria_coordenada(chr(j), i))) == "?" and\
-                 obtem_numero_minas_vizinhas(m, cria_coordenada(chr(j), i)) == 0:
-                campo += " "
-            elif parcela_para_str(obtem_parcela(m, cria_coordenada(chr(j), i))) == "?" and\
-                obtem_numero_minas_vizinhas(m, cria_coordenada(chr(j), i)) != 0:
-                campo += (str(obtem_numero_minas_vizinhas(m, cria_coordenada(chr(j), i))))
+            coordenada = cria_coordenada(chr(j), i)
+            parcela = parcela_para_str(obtem_parcela(m, coordenada))
+            if parcela == "?":
+                vizinhas = obtem_numero_minas_vizinhas(m, coordenada)
+                campo += str(vizinhas) if vizinhas != 0 else " "
             else:
-                campo += parcela_para_str(obtem_parcela(m, cria_coordenada(chr(j), i)))
+                campo += parcela
         campo += "|\n%0.2d|" %(i + 1)
     return campo
 
@@ -720,32 +1021,49 @@ def campo_para_str(m):
 
 
 #funções de alto nível
-def coloca_minas(m, c, g, n): 
+def coloca_minas(m, c, g, n, modo="rejeicao"): 
     """Modifica destrutivamente o campo escondendo n minas em parcelas
-    dentro do campo.
+    dentro do campo. No modo "rejeicao" são geradas coordenadas aleatórias,
+    descartando as que coincidem com c, com as suas vizinhas ou com parcelas
+    já minadas; no modo "baralhamento" as minas são escolhidas entre as parcelas
+    livres por um baralhamento de Fisher-Yates parcial, com um número aleatório
+    por mina.
 
     Args:
         m (TAD campo): campo sem minas
         c (TAD coordenada): coordenada
         g (TAD gerador): gerador
         n (int): número de minas
+        modo (str, optional): "rejeicao" ou "baralhamento". Defaults to "rejeicao".
+
+    Raises:
+        ValueError: Argumentos inválidos
     
     Returns:
         dict: campo minado
     """
-    def coloca_minas_aux(m, c, coordenada_aleatoria, g, n):
-        if n == 0:
-            return m
-        elif not coordenadas_iguais( coordenada_aleatoria, c) and coordenada_aleatoria not\
-            in obtem_coordenadas_vizinhas(c) and not eh_parcela_minada(obtem_parcela(m, coordenada_aleatoria)):
-            return esconde_mina(obtem_parcela(m, coordenada_aleatoria)) and \
-                coloca_minas_aux(m, c, obtem_coordenada_aleatoria(cria_coordenada(obtem_ultima_coluna(m),\
-                     obtem_ultima_linha(m)), g), g, n - 1)
-        else:
-            return coloca_minas_aux(m, c, obtem_coordenada_aleatoria(cria_coordenada(obtem_ultima_coluna(m),\
-                 obtem_ultima_linha(m)), g), g, n)
-    return coloca_minas_aux(m, c, obtem_coordenada_aleatoria(cria_coordenada(obtem_ultima_coluna(m),\
-         obtem_ultima_linha(m)), g), g, n)
+    ultima = cria_coordenada(obtem_ultima_coluna(m), obtem_ultima_linha(m))
+    if modo == "rejeicao":
+        coordenada_aleatoria = obtem_coordenada_aleatoria(ultima, g)
+        while n > 0:
+            if not coordenadas_iguais(coordenada_aleatoria, c) and coordenada_aleatoria not\
+                in obtem_coordenadas_vizinhas(c) and not eh_parcela_minada(obtem_parcela(m, coordenada_aleatoria)):
+                esconde_mina(obtem_parcela(m, coordenada_aleatoria))
+                n -= 1
+            coordenada_aleatoria = obtem_coordenada_aleatoria(ultima, g)
+        return m
+    if modo != "baralhamento":
+        raise ValueError("coloca_minas: argumentos invalidos")
+    livres = [coordenada for coordenada in obtem_tabela_vizinhas(obtem_ultima_coluna(m),\
+         obtem_ultima_linha(m)) if not coordenadas_iguais(coordenada, c) and coordenada not in\
+             obtem_coordenadas_vizinhas(c) and not eh_parcela_minada(obtem_parcela(m, coordenada))]
+    if not (type(n) == int and 0 <= n <= len(livres)):
+        raise ValueError("coloca_minas: argumentos invalidos")
+    for i in range(n):
+        j = i + gera_numero_aleatorio(g, len(livres) - i) - 1
+        livres[i], livres[j] = livres[j], livres[i]
+        esconde_mina(obtem_parcela(m, livres[i]))
+    return m
 
 
 def limpa_campo(m, c):
@@ -760,26 +1078,40 @@ def limpa_campo(m, c):
     Returns:
         dict: campo modificado
     """
-    def limpa_campo_aux(m, vizinhas):
-        if vizinhas == ():
-            return m
-        if eh_coordenada_do_campo(m, vizinhas[0]) and eh_parcela_tapada(obtem_parcela(m, vizinhas[0])):
-            limpa_parcela(obtem_parcela(m, vizinhas[0]))     
-            if obtem_numero_minas_vizinhas(m, vizinhas[0]) == 0:
-                return limpa_campo_aux(m, obtem_coordenadas_vizinhas(vizinhas[0])) and\
-                     limpa_campo_aux(m, vizinhas[1:])
-            else: 
-                return limpa_campo_aux(m, vizinhas[1:])
-        else:
-            return limpa_campo_aux(m, vizinhas[1:])
-    if not(eh_parcela_limpa(obtem_parcela(m, c))):
-        limpa_parcela(obtem_parcela(m, c))     
-        if obtem_numero_minas_vizinhas(m, c) != 0 or eh_parcela_minada(obtem_parcela(m, c)):
-            return m
-        else:
-            return limpa_campo_aux(m, obtem_coordenadas_vizinhas(c))
-    else:
-        return m
+    limpa_campo_bfs(m, c)
+    return m
+
+
+def limpa_campo_bfs(m, c):
+    """Modifica destrutivamente o campo da mesma forma que limpa_campo, mas
+    percorre as parcelas vizinhas em largura com uma fila, visitando cada
+    parcela no máximo uma vez, e devolve as coordenadas das parcelas limpas.
+
+    Args:
+        m (TAD campo): campo
+        c (TAD coordenada): coordenada
+
+    Returns:
+        set: conjunto das coordenadas das parcelas que foram limpas
+    """
+    if eh_parcela_limpa(obtem_parcela(m, c)):
+        return set()
+    limpa_parcela(obtem_parcela(m, c))
+    limpas = {c}
+    if eh_parcela_minada(obtem_parcela(m, c)):
+        return limpas
+    vizinhas = obtem_tabela_vizinhas(obtem_ultima_coluna(m), obtem_ultima_linha(m))
+    fila = deque([c])
+    while fila:
+        coordenada = fila.popleft()
+        if obtem_numero_minas_vizinhas(m, coordenada) == 0:
+            for vizinha in vizinhas[coordenada]:
+                parcela = obtem_parcela(m, vizinha)
+                if eh_parcela_tapada(parcela):
+                    limpa_parcela(parcela)
+                    limpas.add(vizinha)
+                    fila.append(vizinha)
+    return limpas
 
 
 ### Funções adicionais ###